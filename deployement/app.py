@@ -1,14 +1,66 @@
-from flask import Flask, request, render_template
+from flask import Flask, request, render_template, jsonify
 import os
-from investement_prediction import StartupInvestmentPredictor
+import sys
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT_DIR)
+
+from src.data_processing.ft_ing import FeatureEngineer
+from src.models.export import load_scorer, scorer_path
+from src.serving.ranking import RankingIndex
+from src.serving.similarity import SimilarityIndex
+from src.serving.score_store import ScoreStore
+from src.monitoring.drift import DriftMonitor
 
 app = Flask(__name__)
 UPLOAD_FOLDER = 'data'
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
+app.config['ARTIFACTS'] = os.path.join(ROOT_DIR, 'artifacts')
+app.config['RANKING_INDEX'] = os.path.join(ROOT_DIR, 'artifacts', 'ranking_index.pkl')
+app.config['SIMILARITY_INDEX'] = os.path.join(ROOT_DIR, 'artifacts', 'similarity_index.npz')
+app.config['SCORE_STORE'] = os.path.join(ROOT_DIR, 'artifacts', 'score_store')
+app.config['DRIFT_REFERENCE'] = os.path.join(ROOT_DIR, 'artifacts', 'drift_reference.json')
+app.config['DRIFT_WINDOW'] = os.path.join(ROOT_DIR, 'artifacts', 'drift_window.json')
+
 # Ensure the data folder exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+_scorer = {}
+
+def get_scorer():
+    """
+    Modèle de scoring (compilé, à défaut pipeline joblib d'un modèle texte),
+    rechargé quand `main.py train` l'a remplacé ; None sans modèle.
+    """
+    path = scorer_path(app.config['ARTIFACTS'])
+    if path is None:
+        return None
+    stamp = (path, os.path.getmtime(path))
+    if _scorer.get('stamp') != stamp:
+        _scorer['model'], _ = load_scorer(app.config['ARTIFACTS'])
+        _scorer['stamp'] = stamp
+    return _scorer['model']
+
+def _model_input(scorer, X, raw):
+    """Features du modèle, plus la colonne texte brute pour un modèle texte."""
+    text_col = scorer.metadata.get('text_col')
+    if text_col is None:
+        return X
+    return X.assign(**{text_col: raw[text_col].fillna('').astype(str)})
+
+_indexes = {}
+
+def get_index(config_key, cls):
+    """Index persisté, rechargé quand la CLI l'a réécrit."""
+    path = app.config[config_key]
+    mtime = os.path.getmtime(path)
+    if config_key not in _indexes or _indexes[config_key][0] != mtime:
+        _indexes[config_key] = (mtime, cls.load(path))
+    return _indexes[config_key][1]
+
 @app.route("/", methods=["GET", "POST"])
 def upload_file():
     if request.method == "POST":
@@ -22,7 +74,8 @@ def upload_file():
             file_path = os.path.join(app.config['UPLOAD_FOLDER'], 'cleaned_data.csv')
             file.save(file_path)
 
-            # Initialize predictor
+            # Initialize predictor (sklearn chargé seulement pour cette route)
+            from investement_prediction import StartupInvestmentPredictor
             predictor = StartupInvestmentPredictor(file_path)
             predictor.load_and_preprocess_data()
             model_performance, top_indices = predictor.train_models()
@@ -32,6 +85,92 @@ def upload_file():
 
     return render_template("upload.html")
 
+@app.route("/score", methods=["POST"])
+def score():
+    if 'file' not in request.files or request.files['file'].filename == '':
+        return "No file selected", 400
+    scorer = get_scorer()
+    if scorer is None:
+        return "No trained model available, run training first", 503
+
+    fe = FeatureEngineer(as_of=request.args.get('as_of') or scorer.metadata.get('as_of'))
+    fe.top_markets_ = scorer.metadata.get('top_markets')
+    fe.regions_ = scorer.metadata.get('regions')
+    raw = pd.read_csv(request.files['file'])
+    X = _model_input(scorer, fe.transform(raw), raw)
+    preds = np.expm1(scorer.predict(X))
+
+    companies = fe.df_full['Company'] if 'Company' in fe.df_full else X.index
+    return jsonify([{'Company': c, 'predicted_market_value': float(p)}
+                    for c, p in zip(companies, preds)])
+
+@app.route("/top", methods=["GET"])
+def top():
+    if not os.path.exists(app.config['RANKING_INDEX']):
+        return "No ranking index available, run scoring first", 503
+    rows = get_index('RANKING_INDEX', RankingIndex).top(n=request.args.get('n', 20, type=int),
+                             markets=request.args.getlist('market'),
+                             region=request.args.get('region'),
+                             stage=request.args.get('stage'))
+    return jsonify(rows)
+
+@app.route("/similar", methods=["GET"])
+def similar():
+    if not os.path.exists(app.config['SIMILARITY_INDEX']):
+        return "No similarity index available, run `main.py similar` first", 503
+    index = get_index('SIMILARITY_INDEX', SimilarityIndex)
+    company, text = request.args.get('company'), request.args.get('text')
+    if company is None and text is None:
+        return "Provide company or text", 400
+    if company is not None and company not in index.positions:
+        return f"Unknown company: {company}", 404
+    rows = index.query(company=company, text=text, k=request.args.get('k', 10, type=int))
+    return jsonify([{'Company': c, 'similarity': s} for c, s in rows])
+
+@app.route("/investor/<company>", methods=["GET"])
+def investor(company):
+    if not os.path.exists(os.path.join(app.config['SCORE_STORE'], 'CURRENT')):
+        return "No score store available, run scoring first", 503
+    record = get_index('SCORE_STORE', ScoreStore).get(company)
+    if record is None:
+        return f"Unknown company: {company}", 404
+    return jsonify(record)
+
+@app.route("/investors", methods=["GET"])
+def investors():
+    if not os.path.exists(os.path.join(app.config['SCORE_STORE'], 'CURRENT')):
+        return "No score store available, run scoring first", 503
+    store = get_index('SCORE_STORE', ScoreStore)
+    return jsonify([record for record in map(store.get, request.args.getlist('company')) if record])
+
+@app.route("/drift", methods=["GET", "POST"])
+def drift():
+    """GET : fenêtre accumulée par `main.py score` ; POST : dérive du fichier envoyé."""
+    if not os.path.exists(app.config['DRIFT_REFERENCE']):
+        return "No drift reference available, run training first", 503
+    reference = get_index('DRIFT_REFERENCE', DriftMonitor)
+    if request.method == "POST":
+        if 'file' not in request.files or request.files['file'].filename == '':
+            return "No file selected", 400
+        scorer = get_scorer()
+        # même date de référence que l'instantané d'entraînement, sinon age_years dérive seul
+        fe = FeatureEngineer(as_of=request.args.get('as_of')
+                             or (scorer.metadata.get('as_of') if scorer is not None else None))
+        if scorer is not None:
+            fe.top_markets_ = scorer.metadata.get('top_markets')
+            fe.regions_ = scorer.metadata.get('regions')
+        raw = pd.read_csv(request.files['file'])
+        X = fe.transform(raw)
+        preds = scorer.predict(_model_input(scorer, X, raw)) if scorer is not None else None
+        window = reference.window().update(X, predictions=preds)
+    elif os.path.exists(app.config['DRIFT_WINDOW']):
+        window = get_index('DRIFT_WINDOW', DriftMonitor)
+    else:
+        window = reference.window()
+    report = reference.report(window)
+    return jsonify({'n_rows': window.n_rows,
+                    'features': report.astype(object).where(report.notna(), None).to_dict('records')})
+
 @app.route("/results", methods=["GET"])
 def results():
     return "Results will be shown here."
@@ -0,0 +1,34 @@
+"""
+Mesure le débit de FeatureEngineer.transform selon le nombre de processus,
+sur le jeu de données répliqué pour atteindre `n_rows` lignes.
+
+    python -m src.benchmarks.featurize [n_rows]
+"""
+import os
+import sys
+import time
+import pandas as pd
+from src.data_processing.ft_ing import FeatureEngineer
+
+
+def run(csv_path='data/cleaned_data.csv', n_rows=200_000, jobs=None):
+    df = pd.read_csv(csv_path)
+    df = pd.concat([df] * (n_rows // len(df) + 1), ignore_index=True).iloc[:n_rows]
+    fe = FeatureEngineer().fit(df)
+
+    cpus = os.cpu_count() or 1
+    jobs = jobs or sorted({1, 2, 4, 8, 16, cpus} & set(range(1, cpus + 1)))
+    rows, base = [], None
+    for n_jobs in jobs:
+        t0 = time.perf_counter()
+        fe.transform(df, n_jobs=n_jobs)
+        elapsed = time.perf_counter() - t0
+        base = base or elapsed
+        rows.append({'n_jobs': n_jobs, 'seconds': elapsed,
+                     'rows_per_s': n_rows / elapsed, 'speedup': base / elapsed})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(run(n_rows=n_rows).to_string(index=False))
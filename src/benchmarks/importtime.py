@@ -0,0 +1,55 @@
+"""
+Mesure le temps d'import du chemin de scoring seul avec `python -X importtime`
+et vérifie qu'il reste sous budget, sans dépendance lourde chargée.
+
+    python -m src.benchmarks.importtime [--budget-ms 800]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+SCORING_MODULES = ['src.cli', 'src.data_processing.ft_ing', 'src.models.export', 'src.models.decision']
+HEAVY_MODULES = ['sklearn', 'lightgbm', 'skfuzzy', 'networkx', 'shap', 'explainerdashboard']
+DEFAULT_BUDGET_MS = 800.0
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def measure(modules=SCORING_MODULES):
+    """Retourne (temps cumulé en ms, {module de premier niveau: ms}, modules chargés)."""
+    code = "import " + ", ".join(modules)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    per_module = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.startswith(' ') and not name.startswith('  '):
+            # une seule indentation : import de premier niveau
+            per_module[name.strip()] = int(cumulative) / 1e3
+    # les sous-modules indentés sont aussi relevés pour détecter les imports lourds
+    loaded = {line.split('|')[-1].strip() for line in proc.stderr.splitlines()
+              if line.startswith('import time:')}
+    return sum(per_module.values()), per_module, loaded
+
+
+def run(budget_ms=DEFAULT_BUDGET_MS):
+    total, per_module, loaded = measure()
+    for name, ms in sorted(per_module.items(), key=lambda kv: -kv[1])[:10]:
+        print(f"{ms:9.1f} ms  {name}")
+    print(f"{total:9.1f} ms  total (budget {budget_ms:.0f} ms)")
+
+    heavy = sorted({m.split('.')[0] for m in loaded} & set(HEAVY_MODULES))
+    ok = total <= budget_ms and not heavy
+    if heavy:
+        print("Heavy modules loaded on the scoring path:", ", ".join(heavy))
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.budget_ms) else 1)
@@ -0,0 +1,52 @@
+"""
+Compare la latence de scoring entre le pipeline sklearn, le Booster LightGBM
+natif (entrée NumPy) et le modèle compilé.
+
+    python -m src.benchmarks.latency
+"""
+import time
+import numpy as np
+import pandas as pd
+from src.data_processing.pipeline import DataPipeline
+from src.models.model import InvestorRegressor
+from src.models.trainer import Trainer
+from src.models.export import CompiledRegressor
+
+
+def _timings(fn, X, repeats):
+    out = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn(X)
+        out.append(time.perf_counter() - t0)
+    return np.asarray(out) * 1e3
+
+
+def run(csv_path='data/cleaned_data.csv', model_type='lgbm', repeats=200):
+    pipe = DataPipeline(csv_path)
+    pipe.load().transform()
+    X_train, X_test, y_train, _ = pipe.split()
+
+    model = InvestorRegressor(model_type)
+    Trainer(model).fit(X_train, y_train)
+    compiled = CompiledRegressor.from_regressor(model)
+    estimator = model.pipe.named_steps['model']
+
+    # lot de 1k lignes obtenu par rééchantillonnage du jeu de test
+    batches = {'1-row': X_test.iloc[[0]],
+               '1k-rows': X_test.sample(1000, replace=True, random_state=0)}
+    rows = []
+    for name, X in batches.items():
+        X_np = X.to_numpy(dtype=np.float64)
+        backends = [('sklearn', model.predict, X), ('compiled', compiled.predict, X_np)]
+        if hasattr(estimator, 'booster_'):
+            backends.insert(1, ('booster', estimator.booster_.predict, X_np))
+        for label, fn, data in backends:
+            t = _timings(fn, data, repeats)
+            rows.append({'batch': name, 'backend': label,
+                         'p50_ms': np.percentile(t, 50), 'p99_ms': np.percentile(t, 99)})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(run().to_string(index=False))
@@ -0,0 +1,61 @@
+"""
+Latence et rappel de SimilarityIndex (IVF) face à la recherche exhaustive, sur
+un corpus synthétique dérivé des descriptions réelles.
+
+    python -m src.benchmarks.similarity [n_rows]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from src.serving.similarity import SimilarityIndex
+
+
+def synthetic_corpus(csv_path='data/cleaned_data.csv', n_rows=100_000, noise=0.3, seed=0):
+    """Variantes bruitées des descriptions réelles (une part des mots remplacée)."""
+    df = pd.read_csv(csv_path)
+    rng = np.random.default_rng(seed)
+    docs = [d.split() for d in df['description'].fillna('')]
+    vocab = np.asarray(sorted({w for d in docs for w in d}))
+    base = rng.integers(0, len(df), n_rows)
+    out = []
+    for i, b in enumerate(base):
+        words = np.asarray(docs[b], dtype=object)
+        mask = rng.random(len(words)) < noise
+        words[mask] = rng.choice(vocab, mask.sum())
+        out.append(' '.join(words))
+    return pd.DataFrame({'Company': [f'investor_{i}' for i in range(n_rows)], 'description': out,
+                         'markets': df['markets'].to_numpy()[base]})
+
+
+def run(n_rows=100_000, n_queries=200, k=10, seed=0):
+    corpus = synthetic_corpus(n_rows=n_rows, seed=seed)
+    t0 = time.perf_counter()
+    index = SimilarityIndex()
+    # insertions incrémentales par lots, comme en production
+    for s in range(0, n_rows, 25_000):
+        index.add(corpus.iloc[s:s + 25_000])
+    build = time.perf_counter() - t0
+
+    queries = np.random.default_rng(seed).choice(corpus['Company'], n_queries, replace=False)
+    rows, recalls = {'ivf': [], 'exact': []}, []
+    for q in queries:
+        res = {}
+        for mode in ('ivf', 'exact'):
+            t = time.perf_counter()
+            res[mode] = index.query(q, k=k, exact=(mode == 'exact'))
+            rows[mode].append((time.perf_counter() - t) * 1e3)
+        truth = {c for c, _ in res['exact']}
+        recalls.append(len(truth & {c for c, _ in res['ivf']}) / max(len(truth), 1))
+
+    report = pd.DataFrame([{'search': mode, 'p50_ms': np.percentile(t, 50), 'p99_ms': np.percentile(t, 99)}
+                           for mode, t in rows.items()])
+    report[f'recall@{k}'] = [np.mean(recalls), 1.0]
+    report['build_s'] = build
+    report['rows'] = len(index)
+    return report
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(run(n_rows=n_rows).to_string(index=False))
@@ -0,0 +1,52 @@
+"""
+Empreinte mémoire et temps d'ajustement du bloc texte creux face au seul
+DataFrame de features numériques (et à son équivalent dense hypothétique).
+
+    python -m src.benchmarks.text_features [n_rows]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from src.data_processing.pipeline import DataPipeline
+from src.models.model import InvestorRegressor
+from src.benchmarks.similarity import synthetic_corpus
+
+
+def _scaled_features(csv_path, n_rows):
+    """Features réelles répliquées, descriptions bruitées pour varier le texte."""
+    pipe = DataPipeline(csv_path, text_col='description', as_of='2025-01-01')
+    pipe.load().transform()
+    df = pipe.df_feat
+    reps = df.sample(n_rows, replace=True, random_state=0).reset_index(drop=True)
+    reps['description'] = synthetic_corpus(csv_path, n_rows=n_rows)['description']
+    return reps
+
+
+def run(csv_path='data/cleaned_data.csv', n_rows=20_000, n_text_features=2 ** 14):
+    df = _scaled_features(csv_path, n_rows)
+    X, y = df.drop(columns=['market_value_usd']), np.log1p(df['market_value_usd'])
+    numeric = X.drop(columns=['description'])
+
+    rows = []
+    for label, text_col, data in [('numeric (dense frame)', None, numeric),
+                                  ('numeric + hashed text (sparse)', 'description', X)]:
+        model = InvestorRegressor('lgbm', text_col=text_col, n_text_features=n_text_features)
+        t0 = time.perf_counter()
+        model.fit(data, y)
+        fit_s = time.perf_counter() - t0
+        if text_col is None:
+            mem = numeric.memory_usage(deep=True, index=False).sum()
+            dense = mem
+        else:
+            Z = model.pipe.named_steps['features'].transform(X)
+            mem = Z.data.nbytes + Z.indices.nbytes + Z.indptr.nbytes
+            dense = Z.shape[0] * Z.shape[1] * 8
+        rows.append({'features': label, 'n_columns': numeric.shape[1] if text_col is None else Z.shape[1],
+                     'memory_mb': mem / 1e6, 'dense_equiv_mb': dense / 1e6, 'fit_s': fit_s})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(run(n_rows=n_rows).to_string(index=False))
@@ -0,0 +1,389 @@
+"""
+Interface en ligne de commande du système de scoring des investisseurs.
+
+    python main.py featurize --input data/cleaned_data.csv
+    python main.py train
+    python main.py cv --jobs 4
+    python main.py score --input new_batch.csv --format parquet
+    python main.py top -n 20 --market Fintech --region Europe --stage Seed
+    python main.py similar --company MyAsiaVC -k 5
+    python main.py sensitivity --configs 5000 --jobs 8
+    python main.py drift
+    python main.py investor MyAsiaVC
+    python main.py benchmark latency
+
+Les intermédiaires (features, modèle, modèle compilé) sont conservés dans
+`--artifacts` et réutilisés : `score` ne réentraîne pas et ne relance pas la CV.
+"""
+import argparse
+import json
+import os
+import sys
+
+os.environ.setdefault("LOKY_MAX_CPU_COUNT", "4")
+
+DEFAULT_INPUT = 'data/cleaned_data.csv'
+DEFAULT_OUTPUT = 'data/final_investor_scores'
+REPORT_COLS = ['Company', 'Stage', 'Dealflow', 'region', 'markets']
+
+
+def _pipeline(args, monitor=None):
+    from src.data_processing.pipeline import DataPipeline
+    pipe = DataPipeline(args.input, cache_dir=os.path.join(args.artifacts, 'cache'), fmt=args.format,
+                        n_jobs=args.jobs, chunksize=args.chunksize, as_of=args.as_of,
+                        text_col=getattr(args, 'text_col', None), monitor=monitor)
+    return pipe.transform()
+
+
+def _drift_window(args):
+    """(référence, fenêtre courante) du suivi de dérive, ou (None, None) sans référence."""
+    from src.monitoring.drift import DriftMonitor
+    ref_path = os.path.join(args.artifacts, 'drift_reference.json')
+    if not os.path.exists(ref_path):
+        return None, None
+    reference = DriftMonitor.load(ref_path)
+    window_path = os.path.join(args.artifacts, 'drift_window.json')
+    window = DriftMonitor.load(window_path) if os.path.exists(window_path) else reference.window()
+    return reference, window
+
+
+def cmd_featurize(args):
+    _, window = _drift_window(args) if args.monitor else (None, None)
+    pipe = _pipeline(args, monitor=window)
+    status = "cache hit" if pipe.cache_hit else "computed"
+    print(f"Features ({status}): {len(pipe.df_feat)} rows x {pipe.df_feat.shape[1]} columns")
+    if window is not None:
+        window.save(os.path.join(args.artifacts, 'drift_window.json'))
+
+
+def cmd_train(args):
+    from src.models.model import InvestorRegressor
+    from src.models.trainer import Trainer
+
+    if args.intervals and args.model != 'lgbm':
+        print("--intervals requires --model lgbm")
+        return 1
+    if args.intervals and args.text_col is not None:
+        print("--intervals cannot be combined with --text (interval ensembles are compiled)")
+        return 1
+
+    pipe = _pipeline(args)
+    X_train, X_test, y_train, y_test = pipe.split()
+
+    model = InvestorRegressor(args.model, text_col=args.text_col)
+    trainer = Trainer(model, out_path=args.artifacts, as_of=pipe.fe.as_of)
+    trainer.fit(X_train, y_train)
+    if args.intervals:
+        trainer.fit_intervals(X_train, y_train, mode=args.interval_mode, n_members=args.intervals,
+                              coverage=args.coverage, n_jobs=args.jobs)
+    trainer.save(top_markets=pipe.fe.top_markets_, regions=pipe.fe.regions_, text_col=args.text_col)
+    trainer.export_drift_reference(X_train)
+    print("Evaluation sur test:", trainer.evaluate(X_test, y_test))
+    if args.text_col is not None:
+        # le bloc texte reste dans sklearn : pas de version compilée, `score`
+        # utilise model.joblib (et non la version compilée d'un ancien modèle)
+        trainer.discard_compiled()
+        print(f"Exported: {os.path.join(args.artifacts, 'model.joblib')} (no compiled model with text features)")
+        return
+    path = trainer.export_compiled(top_markets=pipe.fe.top_markets_, regions=pipe.fe.regions_)
+    print(f"Exported: {path}")
+
+
+def cmd_cv(args):
+    from sklearn.model_selection import cross_val_score, KFold
+    from src.models.model import InvestorRegressor
+
+    pipe = _pipeline(args)
+    X_train, _, y_train, _ = pipe.split()
+    cv = KFold(n_splits=args.folds, shuffle=True, random_state=42)
+    scores = cross_val_score(InvestorRegressor(args.model, text_col=args.text_col).pipe, X_train, y_train,
+                             cv=cv, scoring='r2', n_jobs=args.jobs)
+    print(f"R² moyen (CV {args.folds}-folds): {scores.mean():.3f} ± {scores.std():.3f}")
+
+
+def _score_cache(args, key):
+    """Retourne le chemin des scores déjà calculés pour cette clé, sinon None."""
+    try:
+        with open(os.path.join(args.artifacts, 'cache', 'scores.json')) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('key') == key and os.path.exists(meta.get('path', '')):
+        return meta['path']
+    return None
+
+
+def _ranking_index(args):
+    """Index de classement persisté (mis à jour de façon incrémentale) et son chemin."""
+    from src.serving.ranking import RankingIndex
+    path = os.path.join(args.artifacts, 'ranking_index.pkl')
+    return (RankingIndex.load(path) if os.path.exists(path) else RankingIndex()), path
+
+
+def _synthesize(synth, df, with_intervals):
+    """Score final (et ses bornes) ligne à ligne pour un lot scoré."""
+    import pandas as pd
+    results = []
+    for _, row in df.iterrows():
+        res = {**row.to_dict(), **synth.synthesize_one(row.to_dict(), row['ml_score'])}
+        if with_intervals:
+            res.update(synth.synthesize_interval(res, row['ml_score_lo'], row['ml_score_hi']))
+        results.append(res)
+    return pd.DataFrame(results)
+
+
+def cmd_score(args):
+    import numpy as np
+    import pandas as pd
+    from src.data_processing.ft_ing import FeatureEngineer
+    from src.data_processing.io import FrameWriter, file_digest
+    from src.models.export import CompiledEnsemble, load_scorer
+    from src.models.decision import DecisionSynthesizer
+    from src.models.uncertainty import interval_from_members
+    from src.serving.score_store import ScoreStoreWriter
+
+    # version compilée, à défaut pipeline joblib (modèles avec texte)
+    scorer, model_path = load_scorer(args.artifacts)
+    if scorer is None:
+        print("No trained model, run `main.py train` first")
+        return 1
+    intervals_path = os.path.join(args.artifacts, 'intervals_compiled.npz')
+    has_intervals = os.path.exists(intervals_path)
+    if scorer.metadata.get('pred_range') is None:
+        print("Model has no training score range, retrain with `main.py train`")
+        return 1
+    # par défaut, date de référence du modèle : mêmes âges qu'à l'entraînement
+    fe = FeatureEngineer(as_of=args.as_of or scorer.metadata.get('as_of'))
+    # scores identiques tant que l'entrée, le modèle et la date de référence le sont
+    key = {'input': file_digest(args.input), 'model': file_digest(model_path),
+           'intervals': file_digest(intervals_path) if has_intervals else None,
+           'as_of': fe.as_of.date().isoformat(), 'output': os.path.abspath(args.output),
+           'format': args.format}
+    cached = _score_cache(args, key)
+    if cached:
+        print(f"Scores (cache hit): {cached}")
+        return
+
+    fe.top_markets_ = scorer.metadata.get('top_markets')
+    fe.regions_ = scorer.metadata.get('regions')
+    ensemble = CompiledEnsemble.load(intervals_path) if has_intervals else None
+    _, window = _drift_window(args)
+    index, index_path = _ranking_index(args)
+    synth = DecisionSynthesizer()
+
+    # min-max sur les prédictions d'entraînement : scores comparables d'un lot à l'autre
+    text_col = scorer.metadata.get('text_col')
+    p_min, p_max = scorer.metadata['pred_range']
+    scale = lambda p: np.clip((p - p_min) / (p_max - p_min + 1e-9), 0, 1)
+
+    # chaque lot est scoré, synthétisé et écrit (sortie, magasin, index)
+    # avant la lecture du suivant ; sortie et magasin sont publiés à la fin
+    store = ScoreStoreWriter(os.path.join(args.artifacts, 'score_store'), merge=True)
+    with FrameWriter(args.output, args.format, dtypes=dict.fromkeys(REPORT_COLS, 'string')) as out, store:
+        for chunk in pd.read_csv(args.input, chunksize=args.chunksize):
+            feat = fe.transform(chunk, n_jobs=args.jobs)
+            if text_col is not None:
+                # texte brut du lot, haché par le pipeline (hash_text) lot par lot
+                preds = scorer.predict(feat.assign(**{text_col: chunk[text_col].fillna('').astype(str)}))
+            else:
+                preds = scorer.predict(feat)
+            if window is not None:
+                window.update(feat, predictions=preds)
+            df = pd.concat([chunk[[c for c in REPORT_COLS if c in chunk.columns]], feat], axis=1)
+            df['ml_score'] = scale(preds)
+            if ensemble is not None:
+                lo, _, hi = interval_from_members(ensemble.predict(feat), ensemble.metadata['mode'],
+                                                  ensemble.metadata['coverage'], center=preds)
+                df['ml_score_lo'], df['ml_score_hi'] = scale(lo), scale(hi)
+            final = _synthesize(synth, df, ensemble is not None)
+            out.write(final)
+            store.write(final)
+            index.upsert(final)
+    path = out.path
+    index.save(index_path)
+    if window is not None:
+        window.save(os.path.join(args.artifacts, 'drift_window.json'))
+    os.makedirs(os.path.join(args.artifacts, 'cache'), exist_ok=True)
+    with open(os.path.join(args.artifacts, 'cache', 'scores.json'), 'w') as f:
+        json.dump({'key': key, 'path': path}, f, indent=2)
+    print(f"Exported: {path}")
+
+
+def cmd_top(args):
+    from src.serving.ranking import RankingIndex
+    path = os.path.join(args.artifacts, 'ranking_index.pkl')
+    if not os.path.exists(path):
+        print("No ranking index, run scoring first")
+        return 1
+    index = RankingIndex.load(path)
+    for rank, row in enumerate(index.top(args.n, args.market, args.region, args.stage), 1):
+        print(f"{rank:3d}. {row['final_score']:.3f}  {row['Company']}  "
+              f"[{row.get('Stage')}, {row.get('region')}] {', '.join(row['markets'])}")
+
+
+def cmd_investor(args):
+    from src.serving.score_store import ScoreStore
+    root = os.path.join(args.artifacts, 'score_store')
+    if not os.path.exists(os.path.join(root, 'CURRENT')):
+        print("No score store, run scoring first")
+        return 1
+    store = ScoreStore.load(root)
+    missing = [c for c in args.company if c not in store]
+    if missing:
+        print(f"Unknown company: {', '.join(missing)}")
+    found = store.get_many(args.company)
+    if len(found):
+        print(found.to_string(index=False))
+    return 1 if missing else 0
+
+
+def cmd_similar(args):
+    import pandas as pd
+    from src.serving.similarity import SimilarityIndex
+
+    path = os.path.join(args.artifacts, 'similarity_index.npz')
+    index = SimilarityIndex.load(path) if os.path.exists(path) else SimilarityIndex()
+    size = len(index)
+    index.add(pd.read_csv(args.input))
+    if len(index) != size:
+        index.save(path)
+        print(f"Indexed {len(index) - size} new investors ({len(index)} total)")
+    if args.company is None and args.text is None:
+        return
+    if args.company is not None and args.company not in index.positions:
+        print(f"Unknown company: {args.company}")
+        return 1
+    for company, sim in index.query(company=args.company, text=args.text, k=args.k):
+        print(f"{sim:.3f}  {company}")
+
+
+def cmd_sensitivity(args):
+    from src.data_processing.io import read_frame, write_frame
+    from src.models.sensitivity import random_configs, sensitivity_sweep
+
+    alphas, params = random_configs(args.configs, jitter=args.jitter, seed=args.seed)
+    report = sensitivity_sweep(read_frame(args.scores), alphas, params,
+                               top_n=args.top, n_jobs=args.jobs)
+    metrics = report.columns[-3:]
+    print(report[['alpha', *metrics]].describe().to_string())
+    path = write_frame(report, os.path.join(args.artifacts, 'sensitivity'), args.format)
+    print(f"Exported: {path}")
+
+
+def cmd_drift(args):
+    reference, window = _drift_window(args)
+    if reference is None:
+        print("No drift reference, run training first")
+        return 1
+    if args.reset:
+        window = reference.window()
+        window.save(os.path.join(args.artifacts, 'drift_window.json'))
+        print("Drift window reset")
+        return 0
+    if not window.n_rows:
+        print("Drift window is empty: score a batch (or featurize --monitor) first")
+        return 0
+    print(f"Drift over {window.n_rows} rows vs training snapshot")
+    print(reference.report(window).to_string(index=False, float_format='{:.4f}'.format))
+
+
+def cmd_benchmark(args):
+    if args.name == 'latency':
+        from src.benchmarks import latency
+        print(latency.run(args.input).to_string(index=False))
+        return 0
+    if args.name == 'similarity':
+        from src.benchmarks import similarity
+        print(similarity.run().to_string(index=False))
+        return 0
+    if args.name == 'text':
+        from src.benchmarks import text_features
+        print(text_features.run(args.input).to_string(index=False))
+        return 0
+    if args.name == 'featurize':
+        from src.benchmarks import featurize
+        print(featurize.run(args.input).to_string(index=False))
+        return 0
+    from src.benchmarks import importtime
+    return 0 if importtime.run() else 1
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--input', default=DEFAULT_INPUT, help="CSV d'investisseurs")
+    common.add_argument('--artifacts', default='artifacts', help="répertoire des intermédiaires")
+    common.add_argument('--jobs', type=int, default=1, help="nombre de processus (-1 : tous les cœurs)")
+    common.add_argument('--chunksize', type=int, default=100_000,
+                        help="lignes lues par lot ; `score` transforme, synthétise et écrit "
+                             "(sortie, magasin de scores, index) lot par lot")
+    common.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    common.add_argument('--as-of', dest='as_of', default=None,
+                        help="date de référence des features (AAAA-MM-JJ) ; défaut : celle du "
+                             "modèle pour `score`, sinon la date du premier calcul de ce fichier "
+                             "(mémorisée dans le cache)")
+
+    parser = argparse.ArgumentParser(prog='main.py', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('featurize', parents=[common], help="calcule et met en cache les features")
+    p.add_argument('--monitor', action='store_true', help="ajoute le lot à la fenêtre de dérive")
+
+    model_opts = argparse.ArgumentParser(add_help=False)
+    model_opts.add_argument('--model', choices=['lgbm', 'ridge'], default='lgbm')
+    model_opts.add_argument('--text', dest='text_col', action='store_const', const='description',
+                            help="ajoute le bloc creux haché de la description")
+
+    p = sub.add_parser('train', parents=[common, model_opts], help="entraîne et exporte le modèle")
+    p.add_argument('--intervals', type=int, default=0,
+                   help="taille de l'ensemble d'intervalles (0 : désactivé)")
+    p.add_argument('--interval-mode', choices=['bootstrap', 'quantile'], default='bootstrap')
+    p.add_argument('--coverage', type=float, default=0.9)
+
+    p = sub.add_parser('cv', parents=[common, model_opts], help="validation croisée")
+    p.add_argument('--folds', type=int, default=5)
+
+    p = sub.add_parser('score', parents=[common], help="score un fichier avec le modèle compilé")
+    p.add_argument('--output', default=DEFAULT_OUTPUT, help="fichier de sortie (sans extension)")
+
+    p = sub.add_parser('top', parents=[common], help="top-N filtré sur les scores indexés")
+    p.add_argument('-n', type=int, default=20)
+    p.add_argument('--market', action='append', default=[], help="répétable : tous les marchés requis")
+    p.add_argument('--region')
+    p.add_argument('--stage')
+
+    p = sub.add_parser('investor', parents=[common], help="scores d'investisseurs (magasin mappé)")
+    p.add_argument('company', nargs='+')
+
+    p = sub.add_parser('similar', parents=[common], help="investisseurs similaires (description, marchés)")
+    p.add_argument('--company', help="investisseur de référence")
+    p.add_argument('--text', help="ou texte libre")
+    p.add_argument('-k', type=int, default=10)
+
+    p = sub.add_parser('sensitivity', parents=[common], help="sensibilité à alpha et aux trimf")
+    p.add_argument('--scores', default=DEFAULT_OUTPUT + '.csv', help="scores produits par `score`")
+    p.add_argument('--configs', type=int, default=1000, help="nombre de configurations tirées")
+    p.add_argument('--jitter', type=float, default=0.05, help="bruit relatif sur les points des trimf")
+    p.add_argument('--top', type=int, default=20)
+    p.add_argument('--seed', type=int, default=42)
+
+    p = sub.add_parser('drift', parents=[common], help="dérive des lots scorés vs l'entraînement")
+    p.add_argument('--reset', action='store_true', help="vide la fenêtre courante")
+
+    p = sub.add_parser('benchmark', parents=[common], help="benchmarks de performance")
+    p.add_argument('name', choices=['latency', 'importtime', 'featurize', 'similarity', 'text'])
+
+    return parser
+
+
+COMMANDS = {'featurize': cmd_featurize, 'train': cmd_train, 'cv': cmd_cv,
+            'score': cmd_score, 'top': cmd_top, 'investor': cmd_investor, 'similar': cmd_similar, 'sensitivity': cmd_sensitivity, 'drift': cmd_drift, 'benchmark': cmd_benchmark}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return COMMANDS[args.command](args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
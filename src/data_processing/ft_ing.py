@@ -1,64 +1,153 @@
+import os
 import pandas as pd
 import numpy as np
-import ast
 from collections import Counter
-from datetime import datetime
-from .parser import parse_percent, parse_money, parse_inv_stage
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from .parser import parse_percent, parse_money, parse_inv_stage, parse_markets
 
-class FeatureEngineer:
-    def __init__(self, top_k_markets=8):
-        self.top_k_markets = top_k_markets
-        self.top_markets_ = None
+STAGE_MAP = {'pre-seed':1.0,'seed':0.8,'early':0.6,'series a':0.5,'series b':0.4,'growth':0.3,'late':0.2}
+DROP_COLS = ['Company','description','markets','follow on rate', 'market value','investment by stage','creation date','Stage','Dealflow','region']
 
-    def fit_markets(self, df):
-        lists = df['markets'].apply(lambda s: ast.literal_eval(str(s)) if pd.notna(s) else [])
-        flat = [m for lst in lists for m in lst]
-        counts = Counter(flat)
-        self.top_markets_ = [m for m, _ in counts.most_common(self.top_k_markets)]
 
-    def transform(self, df):
-        df = df.copy()
+def _market_col(m):
+    return f"market__{m.lower().replace(' ','_').replace('/','_')}"
 
-        # Base parsing
-        df['follow_on_rate'] = df['follow on rate'].apply(parse_percent)
-        df['market_value_usd'] = df['market value'].apply(parse_money)
 
-        df['creation date'] = pd.to_datetime(df['creation date'], format='%m-%Y', errors='coerce')
-        df['age_years'] = (pd.Timestamp.today() - df['creation date']).dt.days / 365.25
+def _feature_columns(top_markets, regions):
+    """Ordre des colonnes produites par _engineer pour des vocabulaires donnés."""
+    return (['follow_on_rate', 'market_value_usd', 'age_years', 'pct_seed', 'pct_early', 'pct_growth',
+             'stage_risk', 'dealflow_enc']
+            + [f'region_{r}' for r in regions[1:]]
+            + [_market_col(m) for m in top_markets]
+            + ['growth_x_followon', 'risk_x_age', 'dealflow_x_risk'])
 
 
-        # Investment by stage
-        inv = df['investment by stage'].apply(parse_inv_stage)
-        for c in ['seed', 'early', 'growth']:
-            df[f'pct_{c}'] = inv.apply(lambda d: d.get(c, np.nan))
-        sums = df[['pct_seed','pct_early','pct_growth']].sum(axis=1)
-        for c in ['pct_seed','pct_early','pct_growth']:
-            df[c] = df[c] / sums
+def _engineer(df, top_markets, regions, as_of):
+    """Calcule le bloc de features numériques d'une partition (appelé aussi dans les workers)."""
+    out = pd.DataFrame(index=df.index)
 
-        # encoding Stage / Dealflow / Region
-        stage_map = {'pre-seed':1.0,'seed':0.8,'early':0.6,'series a':0.5,'series b':0.4,'growth':0.3,'late':0.2}
-        df['stage_risk'] = df['Stage'].str.lower().map(stage_map).fillna(0.6)
-        df['dealflow_enc'] = df['Dealflow'].str.capitalize().map({'Low':0,'Medium':1,'High':2})
-        df = pd.get_dummies(df, columns=['region'], prefix='region', drop_first=True)
+    # Base parsing
+    out['follow_on_rate'] = df['follow on rate'].apply(parse_percent)
+    out['market_value_usd'] = df['market value'].apply(parse_money)
 
-        # One-hot sur top markets
-        if self.top_markets_ is None:
-            self.fit_markets(df)
-        for m in self.top_markets_:
-            col = f"market__{m.lower().replace(' ','_').replace('/','_')}"
-            df[col] = df['markets'].apply(lambda s: 1 if pd.notna(s) and m in ast.literal_eval(str(s)) else 0)
+    created = pd.to_datetime(df['creation date'], format='%m-%Y', errors='coerce')
+    out['age_years'] = (as_of - created).dt.days / 365.25
 
+    # Investment by stage
+    inv = df['investment by stage'].apply(parse_inv_stage)
+    for c in ['seed', 'early', 'growth']:
+        out[f'pct_{c}'] = inv.apply(lambda d: d.get(c, np.nan))
+    sums = out[['pct_seed','pct_early','pct_growth']].sum(axis=1)
+    for c in ['pct_seed','pct_early','pct_growth']:
+        out[c] = out[c] / sums
 
-        df["growth_x_followon"] = df["pct_growth"] * df["follow_on_rate"]
-        df["risk_x_age"] = df["stage_risk"] * df["age_years"]
-        df["dealflow_x_risk"] = df["dealflow_enc"] * df["stage_risk"]
+    # encoding Stage / Dealflow / Region (modalités de région apprises au fit)
+    out['stage_risk'] = df['Stage'].str.lower().map(STAGE_MAP).fillna(0.6)
+    out['dealflow_enc'] = df['Dealflow'].str.capitalize().map({'Low':0,'Medium':1,'High':2}).astype(float)
+    for r in regions[1:]:
+        out[f'region_{r}'] = df['region'] == r
 
+    # One-hot sur top markets (liste parsée une seule fois par ligne)
+    lists = df['markets'].apply(parse_markets)
+    for m in top_markets:
+        out[_market_col(m)] = lists.apply(lambda lst: 1 if m in lst else 0)
+
+    out["growth_x_followon"] = out["pct_growth"] * out["follow_on_rate"]
+    out["risk_x_age"] = out["stage_risk"] * out["age_years"]
+    out["dealflow_x_risk"] = out["dealflow_enc"] * out["stage_risk"]
+    return out
 
-        # data seperation ML vs. reporting
-        self.df_full = df.copy()
-        drop_cols = ['Company','description','markets','follow on rate', 'market value','investment by stage','creation date','Stage','Dealflow','region']  
-        df_model = df.drop(columns=drop_cols, errors='ignore')
 
+def _engineer_into_shm(df, top_markets, regions, as_of, shm_name, shape, start):
+    """Worker : écrit son bloc numérique directement dans la mémoire partagée."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        feats = _engineer(df, top_markets, regions, as_of)[list(_feature_columns(top_markets, regions))]
+        block[start:start + len(df)] = feats.to_numpy(dtype=np.float64, na_value=np.nan)
+    finally:
+        shm.close()
 
 
+class FeatureEngineer:
+    def __init__(self, top_k_markets=8, as_of=None):
+        self.top_k_markets = top_k_markets
+        # date de référence pour l'âge : figée pour des features reproductibles
+        self.as_of = pd.Timestamp(as_of if as_of is not None else 'today').normalize()
+        self.top_markets_ = None
+        self.regions_ = None
+
+    def fit_markets(self, df):
+        lists = df['markets'].apply(parse_markets)
+        flat = [m for lst in lists for m in lst]
+        counts = Counter(flat)
+        self.top_markets_ = [m for m, _ in counts.most_common(self.top_k_markets)]
+
+    def fit_regions(self, df):
+        # même convention que get_dummies(drop_first=True) : la 1re modalité triée est la référence
+        self.regions_ = sorted(df['region'].dropna().unique().tolist())
+
+    def fit(self, df):
+        """Apprend les vocabulaires (marchés, régions) sur l'ensemble des données."""
+        self.fit_markets(df)
+        self.fit_regions(df)
+        return self
+
+    def transform(self, df, n_jobs=1, chunksize=None):
+        """
+        Calcule les features. Avec n_jobs > 1, le DataFrame est partitionné et
+        traité dans un pool de processus une fois les vocabulaires appris ici.
+        """
+        if self.top_markets_ is None:
+            self.fit_markets(df)
+        if self.regions_ is None:
+            self.fit_regions(df)
+
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        if n_jobs > 1 and len(df) > 1:
+            feats = self._transform_parallel(df, n_jobs, chunksize)
+        else:
+            feats = _engineer(df, self.top_markets_, self.regions_, self.as_of)
+
+        # data seperation ML vs. reporting
+        df_full = df.drop(columns=['region'], errors='ignore')
+        df_full['creation date'] = pd.to_datetime(df_full['creation date'], format='%m-%Y', errors='coerce')
+        df_full = pd.concat([df_full, feats], axis=1)
+        self.df_full = df_full
+        df_model = df_full.drop(columns=DROP_COLS, errors='ignore')
+
         return df_model.fillna(0)
+
+    def _transform_parallel(self, df, n_jobs, chunksize):
+        # les partitions reçoivent les vocabulaires ajustés : colonnes identiques partout
+        n = len(df)
+        size = -(-n // n_jobs)
+        if chunksize:
+            size = min(size, chunksize)
+        columns = _feature_columns(self.top_markets_, self.regions_)
+        shape = (n, len(columns))
+
+        shm = shared_memory.SharedMemory(create=True, size=max(n * len(columns) * 8, 1))
+        try:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                futures = [pool.submit(_engineer_into_shm, df.iloc[s:s + size], self.top_markets_,
+                                       self.regions_, self.as_of, shm.name, shape, s)
+                           for s in range(0, n, size)]
+                for f in futures:
+                    f.result()
+            # le bloc est lu en place puis copié une seule fois dans le DataFrame
+            block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+            feats = pd.DataFrame(block.copy(), index=df.index, columns=columns)
+            del block
+        finally:
+            shm.close()
+            shm.unlink()
+
+        for col in columns:
+            if col.startswith('region_'):
+                feats[col] = feats[col].astype(bool)
+            elif col.startswith('market__'):
+                feats[col] = feats[col].astype(np.int64)
+        return feats
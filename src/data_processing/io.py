@@ -1,3 +1,5 @@
+import hashlib
+import os
 import pandas as pd
 from pathlib import Path
 
@@ -11,3 +13,82 @@ def load_csv(path: str) -> pd.DataFrame:
     if missing:
         raise ValueError(f"Missing columns: {missing}")
     return df
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """Empreinte SHA-256 du contenu d'un fichier (clé de cache)."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def write_frame(df: pd.DataFrame, path: str, fmt: str = 'csv') -> str:
+    """Écrit un DataFrame en csv ou parquet (pyarrow requis pour parquet)."""
+    path = str(Path(path).with_suffix(f'.{fmt}'))
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    elif fmt == 'csv':
+        df.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Unknown format {fmt}")
+    return path
+
+class FrameWriter:
+    """
+    Écrit un DataFrame lot par lot (csv ou parquet) dans un fichier temporaire,
+    publié par os.replace à la fermeture : jamais de sortie partielle visible.
+    `dtypes` déclare le type des colonnes qui peuvent être entièrement vides
+    dans un lot (texte) : le schéma parquet ne dépend alors plus du premier lot.
+    """
+    def __init__(self, path: str, fmt: str = 'csv', dtypes: dict = None):
+        if fmt not in ('csv', 'parquet'):
+            raise ValueError(f"Unknown format {fmt}")
+        self.path = str(Path(path).with_suffix(f'.{fmt}'))
+        self.fmt = fmt
+        self.dtypes = dtypes or {}
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = self.path + '.tmp'
+        self._parquet = None
+        self._n_chunks = 0
+
+    def write(self, df: pd.DataFrame):
+        df = df.astype({c: t for c, t in self.dtypes.items() if c in df.columns})
+        if self.fmt == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self._tmp, table.schema)
+            self._parquet.write_table(table.cast(self._parquet.schema))
+        else:
+            df.to_csv(self._tmp, mode='a' if self._n_chunks else 'w', header=not self._n_chunks,
+                      index=False)
+        self._n_chunks += 1
+        return self
+
+    def close(self) -> str:
+        if not self._n_chunks:
+            self.write(pd.DataFrame())
+        if self._parquet is not None:
+            self._parquet.close()
+        os.replace(self._tmp, self.path)
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return
+        if self._parquet is not None:
+            self._parquet.close()
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+def read_frame(path: str) -> pd.DataFrame:
+    """Relit un DataFrame écrit par write_frame, format déduit de l'extension."""
+    if str(path).endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, float_precision='round_trip')
@@ -36,5 +36,10 @@ def parse_inv_stage(s):
         except:
             return {}
 
-
-
+def parse_markets(s):
+    if s is None or (isinstance(s,float) and np.isnan(s)): return []
+    if isinstance(s, (list, tuple)): return list(s)
+    try:
+        return list(ast.literal_eval(str(s)))
+    except Exception:
+        return []
@@ -1,20 +1,42 @@
+import hashlib
+import json
+import os
 import pandas as pd
-from sklearn.model_selection import train_test_split
 from .ft_ing import FeatureEngineer
+from .io import file_digest, read_frame, write_frame
 
 class DataPipeline:
     """
     Gère le chargement, la transformation et la séparation des données.
     Version simplifiée — sans sélection de variance, adaptée aux petits datasets.
+    Si `cache_dir` est fourni, les features calculées y sont conservées et relues
+    tant que le fichier source et la date de référence `as_of` n'ont pas changé.
+    Sans `as_of` explicite, la date retenue au premier calcul d'un contenu source
+    y est mémorisée et réutilisée : relancer le lendemain sur le même fichier
+    relit le cache au lieu de tout recalculer.
+    Un `monitor` (DriftMonitor) éventuel reçoit les features de chaque lot.
     """
 
-    def __init__(self, csv_path: str, target_col: str = 'market_value_usd', train_ratio: float = 0.7):
+    def __init__(self, csv_path: str, target_col: str = 'market_value_usd', train_ratio: float = 0.7,
+                 cache_dir: str = None, fmt: str = 'csv', n_jobs: int = 1, chunksize: int = None,
+                 as_of=None, text_col: str = None, monitor=None):
         self.csv_path = csv_path
         self.target_col = target_col
         self.train_ratio = train_ratio
+        self.cache_dir = cache_dir
+        self.fmt = fmt
+        self.n_jobs = n_jobs
+        self.chunksize = chunksize
+        self.as_of = as_of
+        self.text_col = text_col  # colonne texte conservée brute pour le bloc creux
+        self.monitor = monitor
 
         self.df_raw = None
         self.df_feat = None
+        self.df_full = None
+        self.fe = None
+        self.cache_hit = False
+        self._digest = None
 
     def load(self):
         """Charge le CSV brut."""
@@ -22,13 +44,89 @@ class DataPipeline:
         return self
 
     def transform(self):
-        """Applique les features engineering."""
-        fe = FeatureEngineer()
-        self.df_feat = fe.transform(self.df_raw)
+        """Applique les features engineering (ou relit le cache s'il est à jour)."""
+        # une seule lecture du fichier source par transform pour la clé de cache
+        self._digest = file_digest(self.csv_path) if self.cache_dir is not None else None
+        as_of = self.as_of
+        if as_of is None and self.cache_dir is not None:
+            as_of = self._pinned_as_of()
+        self.fe = FeatureEngineer(as_of=as_of)
+        self.cache_hit = self.cache_dir is not None and self._load_cache()
+        if not self.cache_hit:
+            if self.df_raw is None:
+                self.load()
+            self.df_feat = self.fe.transform(self.df_raw, n_jobs=self.n_jobs, chunksize=self.chunksize)
+            self.df_full = self.fe.df_full
+            if self.text_col is not None:
+                self.df_feat[self.text_col] = self.df_full[self.text_col].fillna('').astype(str)
+            if self.cache_dir is not None:
+                self._write_cache()
+        if self.monitor is not None:
+            self.monitor.update(self.df_feat)
         return self
 
+    def _pinned_as_of(self):
+        """Date de référence par défaut de ce contenu source : aujourd'hui au premier calcul, puis figée."""
+        path = os.path.join(self.cache_dir, 'as_of.json')
+        try:
+            with open(path) as f:
+                pinned = json.load(f)
+        except (OSError, ValueError):
+            pinned = {}
+        if self._digest not in pinned:
+            pinned[self._digest] = pd.Timestamp('today').date().isoformat()
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path + '.tmp', 'w') as f:
+                json.dump(pinned, f, indent=2)
+            os.replace(path + '.tmp', path)
+        return pinned[self._digest]
+
+    def _cache_key(self):
+        return {'source': os.path.abspath(self.csv_path), 'digest': self._digest,
+                'top_k_markets': self.fe.top_k_markets, 'as_of': self.fe.as_of.date().isoformat(),
+                'text_col': self.text_col}
+
+    def _entry_dir(self):
+        # une entrée de cache par clé (source, contenu, date de référence...)
+        key = json.dumps(self._cache_key(), sort_keys=True).encode()
+        return os.path.join(self.cache_dir, hashlib.sha256(key).hexdigest()[:16])
+
+    def _meta_path(self):
+        return os.path.join(self._entry_dir(), 'features.json')
+
+    def _load_cache(self):
+        try:
+            with open(self._meta_path()) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if meta.get('key') != self._cache_key() or meta.get('format') != self.fmt:
+            return False
+        if not all(os.path.exists(p) for p in meta['files'].values()):
+            return False
+
+        self.df_feat = read_frame(meta['files']['features'])
+        if self.text_col is not None:
+            # le CSV relit les descriptions vides comme NaN
+            self.df_feat[self.text_col] = self.df_feat[self.text_col].fillna('').astype(str)
+        self.df_full = read_frame(meta['files']['full'])
+        self.fe.top_markets_ = meta['top_markets']
+        self.fe.regions_ = meta['regions']
+        self.fe.df_full = self.df_full
+        return True
+
+    def _write_cache(self):
+        entry = self._entry_dir()
+        files = {'features': write_frame(self.df_feat, os.path.join(entry, 'features'), self.fmt),
+                 'full': write_frame(self.df_full, os.path.join(entry, 'features_full'), self.fmt)}
+        meta = {'key': self._cache_key(), 'format': self.fmt,
+                'top_markets': self.fe.top_markets_, 'regions': self.fe.regions_, 'files': files}
+        with open(self._meta_path(), 'w') as f:
+            json.dump(meta, f, indent=2)
+
     def split(self):
         """Sépare en train/test (indices reproductibles)."""
+        from sklearn.model_selection import train_test_split
         X = self.df_feat.drop(columns=[self.target_col], errors='ignore')
         y = self.df_feat[self.target_col]
         X_train, X_test, y_train, y_test = train_test_split(
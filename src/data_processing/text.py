@@ -0,0 +1,52 @@
+import pandas as pd
+from .parser import parse_markets
+
+DEFAULT_N_FEATURES = 2 ** 18
+
+
+def investor_text(df: pd.DataFrame) -> pd.Series:
+    """Texte libre d'un investisseur : description + marchés (un jeton par marché)."""
+    desc = df['description'].fillna('') if 'description' in df else pd.Series('', index=df.index)
+    if 'markets' not in df:
+        return desc
+    markets = df['markets'].apply(parse_markets).apply(
+        lambda lst: ' '.join('market_' + ''.join(ch if ch.isalnum() else '_' for ch in m.lower())
+                             for m in lst))
+    return desc + ' ' + markets
+
+
+def make_vectorizer(n_features=DEFAULT_N_FEATURES):
+    """HashingVectorizer sans état : aucun vocabulaire à ajuster ni à conserver."""
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return HashingVectorizer(n_features=n_features, ngram_range=(1, 2), stop_words='english',
+                             alternate_sign=False, norm='l2', dtype=float)
+
+
+def hash_text(texts, n_features=DEFAULT_N_FEATURES, chunksize=50_000):
+    """Vectorise les textes par lots en une matrice creuse CSR (jamais densifiée)."""
+    import scipy.sparse as sp
+    vec = make_vectorizer(n_features)
+    texts = list(texts)
+    blocks = [vec.transform(texts[s:s + chunksize]) for s in range(0, len(texts), chunksize)]
+    if not blocks:
+        return sp.csr_matrix((0, n_features))
+    return sp.vstack(blocks, format='csr')
+
+
+def _hash_column(X, text_col, n_features, chunksize):
+    return hash_text(X[text_col].fillna('').astype(str), n_features, chunksize)
+
+
+def make_text_block(text_col='description', n_features=2 ** 14, chunksize=50_000):
+    """
+    Bloc de features pour sklearn : colonnes numériques telles quelles, texte
+    haché en matrice creuse. La sortie reste creuse (sparse_threshold=1).
+    """
+    from sklearn.compose import ColumnTransformer, make_column_selector
+    from sklearn.preprocessing import FunctionTransformer
+    text = FunctionTransformer(_hash_column, accept_sparse=True, validate=False,
+                               kw_args={'text_col': text_col, 'n_features': n_features,
+                                        'chunksize': chunksize})
+    return ColumnTransformer([('num', 'passthrough', make_column_selector(dtype_include=['number', 'bool'])),
+                              ('text', text, [text_col])],
+                             sparse_threshold=1.0)
@@ -5,7 +5,14 @@ class DecisionSynthesizer:
     """Combine la prédiction ML et la décision fuzzy en score final."""
     def __init__(self, alpha: float = 0.6):
         self.alpha = alpha
-        self.fuzzy_ctx = build_fuzzy_system()  # construit une seule fois
+        self._fuzzy_ctx = None
+
+    @property
+    def fuzzy_ctx(self):
+        # construit une seule fois, au premier usage
+        if self._fuzzy_ctx is None:
+            self._fuzzy_ctx = build_fuzzy_system()
+        return self._fuzzy_ctx
 
     def synthesize_one(self, row: Dict, ml_prob: float) -> Dict:
         follow_on = float(row.get('follow_on_rate', 0.0))
@@ -26,3 +33,22 @@ class DecisionSynthesizer:
             'fuzzy_score': fuzzy_val,
             'final_score': final_score
         }
+
+    def synthesize_interval(self, row: Dict, ml_lo: float, ml_hi: float, n_grid: int = 33) -> Dict:
+        """
+        Bornes du score final pour un score ML dans [ml_lo, ml_hi]. Le flou n'étant
+        pas monotone en ml_score, il est évalué (moteur vectorisé) sur une grille
+        de `n_grid` points ; le `final_score` ponctuel de `row` est inclus s'il existe.
+        """
+        import numpy as np
+        from .sensitivity import batch_attractiveness, default_params
+        grid = np.linspace(ml_lo, ml_hi, n_grid)
+        inputs = {'ml_score': grid,
+                  'follow_on': np.full(n_grid, float(row.get('follow_on_rate', 0.0))),
+                  'stage_risk': np.full(n_grid, float(row.get('stage_risk', 0.5))),
+                  'age_years': np.full(n_grid, float(row.get('age_years', 0.0)))}
+        fuzzy = batch_attractiveness(inputs, default_params()[None, :])[0]
+        finals = self.alpha * grid + (1 - self.alpha) * fuzzy / 100
+        if row.get('final_score') is not None:
+            finals = np.append(finals, row['final_score'])
+        return {'final_score_lo': float(finals.min()), 'final_score_hi': float(finals.max())}
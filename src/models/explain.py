@@ -1,7 +1,7 @@
-import shap, numpy as np
-from explainerdashboard import RegressionExplainer
+import numpy as np
 
 def build_shap(pipe, X_background):
+    import shap
     try:
         explainer = shap.Explainer(pipe.predict, X_background)
     except Exception:
@@ -9,5 +9,6 @@ def build_shap(pipe, X_background):
     return explainer
 
 def dashboard_for_best(pipe, X_test, y_test):
+    from explainerdashboard import RegressionExplainer
     rex = RegressionExplainer(pipe, X_test, y_test)
     return rex  # you can launch ExplainerDashboard(rex).run()
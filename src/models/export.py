@@ -0,0 +1,170 @@
+import json
+import os
+import numpy as np
+
+
+def _booster_arrays(booster):
+    """Modèle texte LightGBM d'un Booster mono-sortie, stockable dans un .npz sans pickle."""
+    if booster.num_model_per_iteration() != 1:
+        raise ValueError("Only single-output boosters can be exported")
+    return {'model': np.asarray(booster.model_to_string())}
+
+
+class CompiledRegressor:
+    """
+    Version compilée d'un InvestorRegressor ajusté, évaluée sans sklearn ni
+    pandas : les arbres LightGBM sont servis par le Booster natif sur entrée
+    NumPy (modèle texte stocké dans le .npz), les coefficients Ridge par un
+    produit matriciel. Sert au scoring basse latence.
+    """
+
+    def __init__(self, kind, arrays, feature_names, metadata=None):
+        self.kind = kind
+        self.arrays = arrays
+        self.feature_names = list(feature_names)
+        self.metadata = metadata or {}
+        self._booster = None
+
+    @classmethod
+    def from_booster(cls, booster, feature_names=None, **metadata):
+        """Compile un Booster LightGBM natif."""
+        return cls('lgbm', _booster_arrays(booster), feature_names or booster.feature_name(), metadata)
+
+    @classmethod
+    def from_regressor(cls, regressor, **metadata):
+        """Compile le pipeline ajusté d'un InvestorRegressor."""
+        pipe = regressor.pipe
+        if len(pipe.steps) != 1:
+            raise ValueError("Only single-step pipelines can be compiled")
+        model = pipe.named_steps['model']
+        feature_names = getattr(pipe, 'feature_names_in_', None)
+        if feature_names is None:
+            feature_names = [f"Column_{i}" for i in range(model.n_features_in_)]
+
+        if hasattr(model, 'booster_'):
+            return cls('lgbm', _booster_arrays(model.booster_), feature_names, metadata)
+        if hasattr(model, 'coef_'):
+            arrays = {'coef': np.asarray(model.coef_, dtype=np.float64).ravel(),
+                      'intercept': np.asarray(model.intercept_, dtype=np.float64)}
+            return cls('linear', arrays, feature_names, metadata)
+        raise ValueError(f"Cannot compile model of type {type(model).__name__}")
+
+    def save(self, path):
+        header = json.dumps({'kind': self.kind, 'feature_names': self.feature_names,
+                             'metadata': self.metadata})
+        np.savez(path, header=np.asarray(header), **self.arrays)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as npz:
+            header = json.loads(str(npz['header']))
+            arrays = {k: npz[k] for k in npz.files if k != 'header'}
+        return cls(header['kind'], arrays, header['feature_names'], header['metadata'])
+
+    def _as_matrix(self, X):
+        if hasattr(X, 'reindex'):
+            # DataFrame : on aligne sur les colonnes vues à l'entraînement
+            X = X.reindex(columns=self.feature_names, fill_value=0)
+            X = X.to_numpy(dtype=np.float64, na_value=np.nan)
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected {len(self.feature_names)} features, got {X.shape[1]}")
+        return X
+
+    @property
+    def booster(self):
+        if self._booster is None:
+            import lightgbm as lgb
+            self._booster = lgb.Booster(model_str=str(self.arrays['model']))
+        return self._booster
+
+    def predict(self, X):
+        X = self._as_matrix(X)
+        a = self.arrays
+        if self.kind == 'linear':
+            return X @ a['coef'] + a['intercept']
+        return self.booster.predict(X)
+
+
+class CompiledEnsemble:
+    """Membres compilés partageant les mêmes features, stockés dans un seul fichier."""
+
+    def __init__(self, members, metadata=None):
+        self.members = list(members)
+        self.metadata = metadata or {}
+
+    @property
+    def feature_names(self):
+        return self.members[0].feature_names
+
+    def save(self, path):
+        header = json.dumps({'kinds': [m.kind for m in self.members],
+                             'feature_names': self.feature_names, 'metadata': self.metadata})
+        arrays = {f"m{i}__{k}": v for i, m in enumerate(self.members) for k, v in m.arrays.items()}
+        np.savez(path, header=np.asarray(header), **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as npz:
+            header = json.loads(str(npz['header']))
+            members = []
+            for i, kind in enumerate(header['kinds']):
+                prefix = f"m{i}__"
+                arrays = {k[len(prefix):]: npz[k] for k in npz.files if k.startswith(prefix)}
+                members.append(CompiledRegressor(kind, arrays, header['feature_names']))
+        return cls(members, header['metadata'])
+
+    def predict(self, X):
+        """Prédictions de chaque membre : tableau (n_membres, n_lignes)."""
+        X = self.members[0]._as_matrix(X)
+        return np.vstack([m.predict(X) for m in self.members])
+
+
+class PipelineScorer:
+    """
+    Repli pour les modèles non compilables (bloc texte creux) : pipeline sklearn
+    rechargé par joblib, avec les mêmes métadonnées de scoring que la version
+    compilée. `metadata['text_col']` désigne la colonne brute à lui fournir.
+    """
+
+    def __init__(self, model, metadata=None):
+        self.model = model
+        self.metadata = metadata or {}
+
+    @classmethod
+    def load(cls, path, meta_path):
+        import joblib
+        with open(meta_path) as f:
+            metadata = json.load(f)
+        return cls(joblib.load(path), metadata)
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+
+def scorer_path(artifacts):
+    """
+    Chemin du modèle de scoring des artefacts : version compilée, à défaut le
+    pipeline joblib (modèle texte) ; None sans modèle entraîné.
+    """
+    compiled = os.path.join(artifacts, 'model_compiled.npz')
+    if os.path.exists(compiled):
+        return compiled
+    path = os.path.join(artifacts, 'model.joblib')
+    if os.path.exists(path) and os.path.exists(os.path.join(artifacts, 'model_meta.json')):
+        return path
+    return None
+
+
+def load_scorer(artifacts):
+    """(modèle de scoring, chemin) des artefacts, (None, None) sans modèle entraîné."""
+    path = scorer_path(artifacts)
+    if path is None:
+        return None, None
+    if path.endswith('.npz'):
+        return CompiledRegressor.load(path), path
+    return PipelineScorer.load(path, os.path.join(artifacts, 'model_meta.json')), path
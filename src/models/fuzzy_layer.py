@@ -1,48 +1,59 @@
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
 import numpy as np
 
-def build_fuzzy_system():
-    # Domaines
-    ml_score = ctrl.Antecedent(np.arange(0, 1.01, 0.01), 'ml_score')
-    follow_on = ctrl.Antecedent(np.arange(0, 1.01, 0.01), 'follow_on')
-    stage_risk = ctrl.Antecedent(np.arange(0, 1.01, 0.01), 'stage_risk')
-    age = ctrl.Antecedent(np.arange(0, 40, 1), 'age_years')
-    attractiveness = ctrl.Consequent(np.arange(0, 101, 1), 'attractiveness')
+# Domaines
+UNIVERSES = {
+    'ml_score': np.arange(0, 1.01, 0.01),
+    'follow_on': np.arange(0, 1.01, 0.01),
+    'stage_risk': np.arange(0, 1.01, 0.01),
+    'age_years': np.arange(0, 40, 1),
+    'attractiveness': np.arange(0, 101, 1),
+}
 
-    # Fonctions d'appartenance
-    ml_score['low'] = fuzz.trimf(ml_score.universe, [0, 0, 0.5])
-    ml_score['medium'] = fuzz.trimf(ml_score.universe, [0.3, 0.5, 0.7])
-    ml_score['high'] = fuzz.trimf(ml_score.universe, [0.5, 1, 1])
+# Fonctions d'appartenance (points [a, b, c] des trimf)
+MEMBERSHIPS = {
+    'ml_score': {'low': [0, 0, 0.5], 'medium': [0.3, 0.5, 0.7], 'high': [0.5, 1, 1]},
+    'follow_on': {'low': [0, 0, 0.4], 'medium': [0.3, 0.6, 0.8], 'high': [0.7, 1, 1]},
+    'stage_risk': {'low': [0, 0, 0.4], 'medium': [0.3, 0.6, 0.8], 'high': [0.7, 1, 1]},
+    'age_years': {'young': [0, 0, 5], 'mature': [3, 10, 20], 'old': [15, 25, 40]},
+    'attractiveness': {'low': [0, 0, 40], 'medium': [30, 50, 70], 'high': [60, 100, 100]},
+}
 
-    follow_on['low'] = fuzz.trimf(follow_on.universe, [0, 0, 0.4])
-    follow_on['medium'] = fuzz.trimf(follow_on.universe, [0.3, 0.6, 0.8])
-    follow_on['high'] = fuzz.trimf(follow_on.universe, [0.7, 1, 1])
+# Règles floues : (conjonction d'antécédents, terme de sortie)
+RULES = [
+    ([('ml_score', 'high'), ('follow_on', 'high')], 'high'),
+    ([('ml_score', 'medium'), ('follow_on', 'medium')], 'medium'),
+    ([('ml_score', 'low'), ('follow_on', 'low')], 'low'),
+    ([('stage_risk', 'high')], 'low'),
+    ([('stage_risk', 'medium')], 'medium'),
+    ([('age_years', 'young'), ('ml_score', 'high')], 'high'),
+    ([('age_years', 'mature'), ('follow_on', 'medium')], 'medium'),
+    # règle de secours : si rien n'est activé, score moyen
+    ([('ml_score', 'medium'), ('follow_on', 'low')], 'medium'),
+]
 
-    stage_risk['low'] = fuzz.trimf(stage_risk.universe, [0, 0, 0.4])
-    stage_risk['medium'] = fuzz.trimf(stage_risk.universe, [0.3, 0.6, 0.8])
-    stage_risk['high'] = fuzz.trimf(stage_risk.universe, [0.7, 1, 1])
 
-    age['young'] = fuzz.trimf(age.universe, [0, 0, 5])
-    age['mature'] = fuzz.trimf(age.universe, [3, 10, 20])
-    age['old'] = fuzz.trimf(age.universe, [15, 25, 40])
+def build_fuzzy_system(memberships=None):
+    # skfuzzy (et networkx) ne sont chargés qu'à la construction du système
+    import skfuzzy as fuzz
+    from skfuzzy import control as ctrl
 
-    attractiveness['low'] = fuzz.trimf(attractiveness.universe, [0, 0, 40])
-    attractiveness['medium'] = fuzz.trimf(attractiveness.universe, [30, 50, 70])
-    attractiveness['high'] = fuzz.trimf(attractiveness.universe, [60, 100, 100])
+    memberships = memberships or MEMBERSHIPS
+    variables = {name: ctrl.Antecedent(UNIVERSES[name], name)
+                 for name in UNIVERSES if name != 'attractiveness'}
+    attractiveness = ctrl.Consequent(UNIVERSES['attractiveness'], 'attractiveness')
+    variables['attractiveness'] = attractiveness
 
-    # Règles floues
-    rules = [
-        ctrl.Rule(ml_score['high'] & follow_on['high'], attractiveness['high']),
-        ctrl.Rule(ml_score['medium'] & follow_on['medium'], attractiveness['medium']),
-        ctrl.Rule(ml_score['low'] & follow_on['low'], attractiveness['low']),
-        ctrl.Rule(stage_risk['high'], attractiveness['low']),
-        ctrl.Rule(stage_risk['medium'], attractiveness['medium']),
-        ctrl.Rule(age['young'] & ml_score['high'], attractiveness['high']),
-        ctrl.Rule(age['mature'] & follow_on['medium'], attractiveness['medium']),
-        # règle de secours : si rien n'est activé, score moyen
-        ctrl.Rule(ml_score['medium'] & follow_on['low'], attractiveness['medium'])
-    ]
+    for name, terms in memberships.items():
+        var = variables[name]
+        for term, abc in terms.items():
+            var[term] = fuzz.trimf(var.universe, abc)
+
+    rules = []
+    for antecedents, output in RULES:
+        condition = variables[antecedents[0][0]][antecedents[0][1]]
+        for name, term in antecedents[1:]:
+            condition = condition & variables[name][term]
+        rules.append(ctrl.Rule(condition, attractiveness[output]))
 
     ctrl_sys = ctrl.ControlSystem(rules)
     return ctrl.ControlSystemSimulation(ctrl_sys)
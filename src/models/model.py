@@ -1,14 +1,18 @@
-from sklearn.pipeline import Pipeline
-from sklearn.linear_model import Ridge
-from lightgbm import LGBMRegressor
-
 class InvestorRegressor:
-    """Modèle de régression pour la prédiction de la valeur de marché."""
-    def __init__(self, model_type='lgbm'):
+    """
+    Modèle de régression pour la prédiction de la valeur de marché.
+    Avec `text_col`, la colonne texte est hachée en bloc creux et concaténée
+    aux features numériques ; LightGBM et Ridge la consomment sans densification.
+    """
+    def __init__(self, model_type='lgbm', text_col=None, n_text_features=2 ** 14):
+        # imports différés : sklearn / lightgbm ne sont chargés qu'à l'instanciation
+        from sklearn.pipeline import Pipeline
         if model_type == 'ridge':
+            from sklearn.linear_model import Ridge
             model = Ridge(alpha=1.0)
             steps = [('scaler', None), ('model', model)]
         elif model_type == 'lgbm':
+            from lightgbm import LGBMRegressor
             model = LGBMRegressor(
                 n_estimators=300,
                 learning_rate=0.05,
@@ -23,6 +27,10 @@ class InvestorRegressor:
         else:
             raise ValueError(f"Unknown model {model_type}")
 
+        if text_col is not None:
+            from src.data_processing.text import make_text_block
+            steps.insert(0, ('features', make_text_block(text_col, n_text_features)))
+
         self.pipe = Pipeline([(n, s) for n, s in steps if s is not None])
 
     def fit(self, X, y):
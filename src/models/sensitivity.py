@@ -0,0 +1,167 @@
+"""
+Analyse de sensibilité du score final à alpha et aux paramètres des fonctions
+d'appartenance. L'inférence floue (Mamdani, min/max, centroïde) est réécrite en
+NumPy pour évaluer d'un bloc un lot de configurations sur tout le portefeuille.
+"""
+import numpy as np
+import pandas as pd
+from .fuzzy_layer import UNIVERSES, MEMBERSHIPS, RULES
+
+# Colonnes du DataFrame de scores associées à chaque variable floue
+INPUT_COLS = {'ml_score': 'ml_score', 'follow_on': 'follow_on_rate',
+              'stage_risk': 'stage_risk', 'age_years': 'age_years'}
+DEFAULT_ALPHA = 0.6
+MEMORY_BUDGET = 256 * 2 ** 20  # octets par processus pour les tableaux intermédiaires
+
+
+def param_names(memberships=MEMBERSHIPS):
+    """Noms des paramètres, dans l'ordre du vecteur plat (variable.terme.a|b|c)."""
+    return [f"{var}.{term}.{p}" for var, terms in memberships.items()
+            for term in terms for p in 'abc']
+
+
+def default_params(memberships=MEMBERSHIPS):
+    return np.asarray([v for terms in memberships.values() for abc in terms.values() for v in abc],
+                      dtype=np.float64)
+
+
+def random_configs(n_configs, jitter=0.05, alpha_range=(0.4, 0.8), seed=42):
+    """
+    Tire des configurations autour des valeurs par défaut : bruit gaussien de
+    `jitter` x étendue du domaine sur chaque point, triplets re-triés et bornés.
+    """
+    rng = np.random.default_rng(seed)
+    base = default_params()
+    spans, lows, highs = [], [], []
+    for var, terms in MEMBERSHIPS.items():
+        u = UNIVERSES[var]
+        for _ in range(3 * len(terms)):
+            spans.append(u.max() - u.min()); lows.append(u.min()); highs.append(u.max())
+    noise = rng.normal(0, jitter, size=(n_configs, base.size)) * np.asarray(spans)
+    params = np.clip(base + noise, lows, highs).reshape(n_configs, -1, 3)
+    params = np.sort(params, axis=2).reshape(n_configs, -1)
+    alphas = rng.uniform(*alpha_range, size=n_configs)
+    return alphas, params
+
+
+def _trimf(x, a, b, c):
+    """trimf analytique, diffusé sur (configs, lignes[, points])."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        left = np.where(b > a, (x - a) / (b - a), (x >= a).astype(np.float64))
+        right = np.where(c > b, (c - x) / (c - b), (x <= c).astype(np.float64))
+    return np.clip(np.minimum(left, right), 0.0, 1.0)
+
+
+def batch_attractiveness(inputs, params, grid_size=401, max_bytes=MEMORY_BUDGET):
+    """
+    Score flou (0-100) pour chaque configuration et chaque ligne.
+
+    inputs : dict variable -> (N,) ; params : (C, P) selon param_names().
+    Retourne un tableau (C, N). Sans règle activée, le score vaut 50 comme dans
+    evaluate_attractiveness.
+    """
+    params = np.atleast_2d(params)
+    pos, offset = {}, 0
+    for var, terms in MEMBERSHIPS.items():
+        for term in terms:
+            pos[(var, term)] = offset
+            offset += 3
+
+    def column(var, term, k):
+        return params[:, pos[(var, term)] + k]
+
+    # degrés d'appartenance des entrées, bornées au domaine comme skfuzzy
+    degrees = {}
+    for var in INPUT_COLS:
+        u = UNIVERSES[var]
+        x = np.clip(np.asarray(inputs[var], dtype=np.float64), u.min(), u.max())[None, :]
+        for term in MEMBERSHIPS[var]:
+            a, b, c = (column(var, term, k)[:, None] for k in range(3))
+            degrees[(var, term)] = _trimf(x, a, b, c)
+
+    # activation de chaque terme de sortie (ET = min, cumul des règles = max)
+    n_cfg, n_rows = params.shape[0], len(next(iter(inputs.values())))
+    cuts = {term: np.zeros((n_cfg, n_rows)) for term in MEMBERSHIPS['attractiveness']}
+    for antecedents, output in RULES:
+        act = degrees[antecedents[0]]
+        for ant in antecedents[1:]:
+            act = np.minimum(act, degrees[ant])
+        cuts[output] = np.maximum(cuts[output], act)
+
+    # agrégation sur une grille fine puis centroïde par trapèzes, par tuiles de
+    # lignes : les tableaux (configs, tuile, grille) restent sous `max_bytes`
+    u = UNIVERSES['attractiveness']
+    grid = np.linspace(u.min(), u.max(), grid_size)
+    weights = np.full(grid_size, grid[1] - grid[0]); weights[[0, -1]] /= 2
+    weights = np.stack([weights, weights * grid], axis=1).astype(np.float32)
+    out_mfs = {}
+    for term in cuts:
+        a, b, c = (column('attractiveness', term, k)[:, None, None] for k in range(3))
+        out_mfs[term] = _trimf(grid, a, b, c).astype(np.float32)
+
+    tile = max(int(max_bytes // (2 * n_cfg * grid_size * 4)), 1)  # agrégat + temporaire
+    scores = np.empty((n_cfg, n_rows))
+    for start in range(0, n_rows, tile):
+        rows = slice(start, start + tile)
+        agg = np.zeros((n_cfg, len(range(n_rows)[rows]), grid_size), dtype=np.float32)
+        for term, cut in cuts.items():
+            np.maximum(agg, np.minimum(cut[:, rows, None].astype(np.float32), out_mfs[term]), out=agg)
+        area, moment = np.moveaxis(agg @ weights, -1, 0).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores[:, rows] = np.where(area > 0, moment / area, 50.0)
+    return scores
+
+
+def _final_scores(ml, inputs, alphas, params, max_bytes=MEMORY_BUDGET):
+    fuzzy = batch_attractiveness(inputs, params, max_bytes=max_bytes)
+    return alphas[:, None] * ml[None, :] + (1 - alphas[:, None]) * fuzzy / 100
+
+
+def _evaluate_block(ml, inputs, alphas, params, baseline, top_n, max_bytes):
+    from scipy.stats import kendalltau
+    scores = _final_scores(ml, inputs, alphas, params, max_bytes)
+    base_top = set(np.argsort(-baseline, kind='stable')[:top_n])
+    tops = np.argsort(-scores, axis=1, kind='stable')[:, :top_n]
+    overlap = np.asarray([len(base_top.intersection(t)) / top_n for t in tops])
+    tau = np.asarray([kendalltau(baseline, s)[0] for s in scores])
+    shift = np.abs(scores - baseline[None, :]).mean(axis=1)
+    return overlap, tau, shift
+
+
+def sensitivity_sweep(df_scores, alphas, params, top_n=20, n_jobs=1, block_size=None,
+                      max_bytes=MEMORY_BUDGET):
+    """
+    Évalue toutes les configurations (alpha, paramètres) sur le portefeuille et
+    mesure la stabilité du classement par rapport à la configuration par défaut :
+    recouvrement du top-N, tau de Kendall et décalage moyen du score final.
+    Sans `block_size`, les configurations sont réparties en au moins un bloc
+    par processus, chaque bloc restant sous `max_bytes`.
+    """
+    from joblib import Parallel, delayed, effective_n_jobs
+
+    df = df_scores.dropna(subset=list(INPUT_COLS.values()))
+    ml = df['ml_score'].to_numpy(dtype=np.float64)
+    inputs = {var: df[col].to_numpy(dtype=np.float64) for var, col in INPUT_COLS.items()}
+    alphas = np.asarray(alphas, dtype=np.float64).ravel()
+    params = np.atleast_2d(params)
+    baseline = _final_scores(ml, inputs, np.asarray([DEFAULT_ALPHA]), default_params()[None, :])[0]
+    top_n = min(top_n, len(df))
+    if block_size is None:
+        # tableaux (configs, lignes) float64 : degrés, activations, scores et tris
+        n_arrays = sum(len(t) for t in MEMBERSHIPS.values()) + 8
+        budget_block = int(max_bytes // (n_arrays * max(len(df), 1) * 8))
+        per_job = -(-len(alphas) // effective_n_jobs(n_jobs))
+        block_size = max(min(budget_block, per_job), 1)
+
+    blocks = [slice(s, s + block_size) for s in range(0, len(alphas), block_size)]
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluate_block)(ml, inputs, alphas[b], params[b], baseline, top_n, max_bytes)
+        for b in blocks)
+    overlap, tau, shift = (np.concatenate(r) for r in zip(*results))
+
+    report = pd.DataFrame(params, columns=param_names())
+    report.insert(0, 'alpha', alphas)
+    report[f'top{top_n}_overlap'] = overlap
+    report['kendall_tau'] = tau
+    report['mean_abs_shift'] = shift
+    return report
@@ -1,36 +1,108 @@
+import json
 import numpy as np
-from sklearn.metrics import mean_squared_error, r2_score
-from sklearn.preprocessing import MinMaxScaler
-import joblib
+import os
 import pandas as pd
+from .export import CompiledRegressor
 
 class Trainer:
     """Gère l'entraînement, l'évaluation et l'export du score ML."""
-    def __init__(self, model, out_path='artifacts/'):
+    def __init__(self, model, out_path='artifacts/', as_of=None):
+        from sklearn.preprocessing import MinMaxScaler
         self.model = model
         self.out_path = out_path
+        self.as_of = as_of  # date de référence des features d'entraînement
         self.scaler = MinMaxScaler()
+        self.intervals = None
+        self.pred_range = None
 
     def fit(self, X_tr, y_tr):
         self.model.fit(X_tr, np.log1p(y_tr))
+        # bornes fixes de normalisation du score ML, communes à tous les lots scorés
+        preds = self.model.predict(X_tr)
+        self.pred_range = (float(preds.min()), float(preds.max()))
+        return self
+
+    def fit_intervals(self, X_tr, y_tr, mode='bootstrap', n_members=50, coverage=0.9, n_jobs=-1):
+        """Ajuste un ensemble d'intervalles autour du modèle (même cible log1p)."""
+        from .uncertainty import IntervalEnsemble
+        self.intervals = IntervalEnsemble(self.model, mode=mode, n_members=n_members,
+                                          coverage=coverage, n_jobs=n_jobs)
+        self.intervals.fit(X_tr, np.log1p(y_tr))
         return self
 
     def evaluate(self, X_te, y_te):
+        from sklearn.metrics import mean_squared_error, r2_score
         y_pred = np.expm1(self.model.predict(X_te))
         rmse = np.sqrt(mean_squared_error(y_te, y_pred))
         r2 = r2_score(y_te, y_pred)
         return {'rmse': rmse, 'r2': r2}
 
+    def scale(self, preds):
+        """Score ML dans [0, 1] sur les bornes des prédictions d'entraînement (comme `score`)."""
+        p_min, p_max = self.pred_range
+        return np.clip((preds - p_min) / (p_max - p_min + 1e-9), 0, 1)
+
     def export_ml_scores(self, X_test, df_ref: pd.DataFrame):
         preds = self.model.predict(X_test)
-        scaled = (preds - preds.min()) / (preds.max() - preds.min() + 1e-9)
 
         df_ref = df_ref.copy()
         df_ref['ml_score'] = np.nan
-        df_ref.loc[X_test.index, 'ml_score'] = scaled
+        df_ref.loc[X_test.index, 'ml_score'] = self.scale(preds)
+
+        if self.intervals is not None:
+            # bornes ramenées sur la même échelle que le score ponctuel
+            lo, _, hi = self.intervals.predict_interval(X_test, center=preds)
+            for col, bound in (('ml_score_lo', lo), ('ml_score_hi', hi)):
+                df_ref[col] = np.nan
+                df_ref.loc[X_test.index, col] = self.scale(bound)
         return df_ref
 
+    def _metadata(self, **metadata):
+        """Métadonnées de scoring communes aux modèles exportés (date, bornes du score ML)."""
+        if self.as_of is not None:
+            metadata.setdefault('as_of', pd.Timestamp(self.as_of).date().isoformat())
+        if self.pred_range is not None:
+            metadata.setdefault('pred_range', list(self.pred_range))
+        return metadata
 
-    def save(self):
+    def save(self, **metadata):
+        """Sauvegarde le pipeline (model.joblib) et ses métadonnées de scoring (model_meta.json)."""
+        import joblib
+        os.makedirs(self.out_path, exist_ok=True)
         joblib.dump(self.model, f"{self.out_path}/model.joblib")
+        with open(os.path.join(self.out_path, 'model_meta.json'), 'w') as f:
+            json.dump(self._metadata(**metadata), f, indent=2)
+
+    def export_drift_reference(self, X_tr, filename='drift_reference.json'):
+        """Instantané de référence (features et prédictions d'entraînement) pour le suivi de dérive."""
+        from src.monitoring.drift import DriftMonitor, PREDICTION_COL
+        reference = DriftMonitor.from_frame(X_tr.assign(**{PREDICTION_COL: self.model.predict(X_tr)}))
+        path = reference.save(os.path.join(self.out_path, filename))
+        window_path = os.path.join(self.out_path, 'drift_window.json')
+        if os.path.exists(window_path):
+            os.remove(window_path)  # fenêtre alignée sur les bornes de l'ancienne référence
+        return path
+
+    def discard_compiled(self, filename='model_compiled.npz'):
+        """
+        Supprime les modèles compilés d'un entraînement précédent (devenus
+        obsolètes) : le scoring se rabat alors sur model.joblib.
+        """
+        for name in (filename, 'intervals_compiled.npz'):
+            path = os.path.join(self.out_path, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def export_compiled(self, filename='model_compiled.npz', **metadata):
+        """Exporte le modèle ajusté en version compilée pour le scoring."""
+        os.makedirs(self.out_path, exist_ok=True)
+        metadata = self._metadata(**metadata)
+        compiled = CompiledRegressor.from_regressor(self.model, **metadata)
+        path = compiled.save(os.path.join(self.out_path, filename))
+        intervals_path = os.path.join(self.out_path, 'intervals_compiled.npz')
+        if self.intervals is not None:
+            self.intervals.compile(**metadata).save(intervals_path)
+        elif os.path.exists(intervals_path):
+            os.remove(intervals_path)  # ensemble d'un ancien modèle
+        return path
 
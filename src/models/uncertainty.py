@@ -0,0 +1,113 @@
+import numpy as np
+
+
+def _native_params(estimator):
+    """Traduit les hyperparamètres d'un LGBMRegressor en paramètres LightGBM natifs."""
+    p = estimator.get_params()
+    return {
+        'objective': 'regression',
+        'learning_rate': p['learning_rate'],
+        'max_depth': p['max_depth'],
+        'num_leaves': p['num_leaves'],
+        'feature_fraction': p['colsample_bytree'],
+        'min_child_samples': p['min_child_samples'],
+        'reg_alpha': p['reg_alpha'],
+        'reg_lambda': p['reg_lambda'],
+        'verbose': -1,
+        'num_threads': 1,
+    }, p['n_estimators'], p['random_state'] or 0
+
+
+def interval_from_members(preds, mode, coverage, center=None):
+    """
+    (bas, médiane, haut) à partir des prédictions (n_membres, n_lignes) d'un
+    ensemble. Avec `center` (prédiction ponctuelle du modèle principal),
+    l'intervalle est recentré dessus en conservant ses écarts à la médiane.
+    """
+    if mode == 'quantile':
+        lo, mid, hi = np.sort(preds, axis=0)  # garantit bas <= médiane <= haut
+    else:
+        q = [(1 - coverage) / 2 * 100, 50, (1 + coverage) / 2 * 100]
+        lo, mid, hi = np.percentile(preds, q, axis=0)
+    if center is not None:
+        shift = np.asarray(center) - mid
+        lo, mid, hi = lo + shift, mid + shift, hi + shift
+    return lo, mid, hi
+
+
+class IntervalEnsemble:
+    """
+    Intervalles de prédiction autour d'un InvestorRegressor LightGBM.
+
+    mode='bootstrap' : `n_members` ajustements rééchantillonnés (sous-échantillon
+    sans remise à 63,2 %, tiré une seule fois par membre et conservé pendant
+    tout l'ajustement, graine différente par membre), intervalle empirique.
+    mode='quantile'  : trois modèles à objectif quantile (bas, médiane, haut).
+    Le bootstrap mesure l'incertitude du modèle ; seul le mode quantile inclut
+    le bruit propre aux données.
+
+    Tous les membres s'entraînent en parallèle (threads) sur un unique
+    lgb.Dataset déjà discrétisé : la mémoire des données ne croît pas avec la
+    taille de l'ensemble.
+    """
+
+    def __init__(self, regressor, mode='bootstrap', n_members=50, coverage=0.9, n_jobs=-1):
+        if mode not in ('bootstrap', 'quantile'):
+            raise ValueError(f"Unknown interval mode {mode}")
+        if type(regressor.pipe.named_steps['model']).__name__ != 'LGBMRegressor':
+            raise ValueError("Interval ensembles require the 'lgbm' model")
+        self.regressor = regressor
+        self.mode = mode
+        self.n_members = n_members if mode == 'bootstrap' else 3
+        self.coverage = coverage
+        self.n_jobs = n_jobs
+        self.features_ = None
+        self.boosters_ = []
+
+    def _member_params(self, base, seed, rounds):
+        if self.mode == 'quantile':
+            alphas = [(1 - self.coverage) / 2, 0.5, (1 + self.coverage) / 2]
+            return [{**base, 'objective': 'quantile', 'alpha': a, 'seed': seed} for a in alphas]
+        # bagging_freq >= rounds : un seul tirage par membre. Avec un tirage par
+        # itération, chaque membre finit par voir toutes les lignes et l'écart
+        # entre membres ne reflète plus que le bruit du boosting stochastique.
+        return [{**base, 'bagging_fraction': 0.632, 'bagging_freq': rounds,
+                 'seed': seed + i, 'bagging_seed': seed + i, 'feature_fraction_seed': seed + i}
+                for i in range(self.n_members)]
+
+    def _matrix(self, X):
+        return self.features_.transform(X) if self.features_ is not None else X
+
+    def fit(self, X, y):
+        import lightgbm as lgb
+        from joblib import Parallel, delayed
+        from sklearn.base import clone
+
+        pipe = self.regressor.pipe
+        if len(pipe.steps) > 1:
+            # bloc de features (texte creux) ajusté une fois, partagé par les membres
+            self.features_ = clone(pipe[:-1]).fit(X, y)
+        base, rounds, seed = _native_params(pipe.named_steps['model'])
+        dataset = lgb.Dataset(self._matrix(X), label=np.asarray(y), params={'verbose': -1},
+                              free_raw_data=True).construct()
+
+        self.boosters_ = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+            delayed(lgb.train)(params, dataset, num_boost_round=rounds)
+            for params in self._member_params(base, seed, rounds))
+        return self
+
+    def member_predictions(self, X):
+        X = self._matrix(X)
+        return np.vstack([b.predict(X) for b in self.boosters_])
+
+    def predict_interval(self, X, center=None):
+        """Retourne (bas, médiane, haut) pour chaque ligne."""
+        return interval_from_members(self.member_predictions(X), self.mode, self.coverage, center)
+
+    def compile(self, **metadata):
+        """Version compilée (NumPy) de l'ensemble, pour le chemin de scoring."""
+        from .export import CompiledEnsemble, CompiledRegressor
+        if self.features_ is not None:
+            raise ValueError("Interval ensembles with text features cannot be compiled")
+        members = [CompiledRegressor.from_booster(b) for b in self.boosters_]
+        return CompiledEnsemble(members, {'mode': self.mode, 'coverage': self.coverage, **metadata})
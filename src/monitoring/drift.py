@@ -0,0 +1,221 @@
+import json
+import os
+import tempfile
+import numpy as np
+
+PREDICTION_COL = 'prediction'
+EXCLUDED_COLS = {'market_value_usd'}
+PSI_THRESHOLDS = (0.1, 0.25)   # stable / dérive modérée / dérive
+_EPS = 1e-4                    # lissage des proportions nulles dans le PSI
+OTHER = '__other__'            # modalités au-delà du plafond d'un sketch catégoriel
+
+
+def _category_key(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return 'nan'
+    try:
+        return repr(float(value))   # True, 1 et 1.0 tombent dans la même catégorie
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class FeatureSketch:
+    """
+    Résumé fusionnable d'une variable, en mémoire constante : histogramme sur
+    des bornes fixées par les quantiles d'entraînement (plus une case NaN) pour
+    les variables numériques, comptages par modalité pour les catégorielles
+    (au plus `max_keys`, les nouvelles modalités au-delà vont dans OTHER),
+    et moyenne/variance en ligne (Welford, fusion de Chan).
+    """
+
+    def __init__(self, kind, edges=None, categories=None, max_keys=None):
+        self.kind = kind
+        self.max_keys = max_keys
+        self.edges = np.asarray(edges if edges is not None else [], dtype=np.float64)
+        self.counts = (np.zeros(self.edges.size + 2, dtype=np.int64) if kind == 'numeric'
+                       else dict.fromkeys(categories or [], 0))
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def empty(self):
+        """Sketch vide de même structure (mêmes bornes ; modalités figées sur celles-ci)."""
+        if self.kind == 'numeric':
+            return FeatureSketch(self.kind, self.edges)
+        return FeatureSketch(self.kind, categories=list(self.counts), max_keys=len(self.counts))
+
+    def _count(self, key, n):
+        if key not in self.counts and self.max_keys is not None and len(self.counts) >= self.max_keys:
+            key = OTHER
+        self.counts[key] = self.counts.get(key, 0) + n
+
+    def update(self, values):
+        values = np.asarray(values)
+        if self.kind == 'numeric':
+            x = values.astype(np.float64)
+            nan = np.isnan(x)
+            self.counts[-1] += int(nan.sum())
+            x = x[~nan]
+            self.counts[:-1] += np.bincount(np.searchsorted(self.edges, x, side='right'),
+                                            minlength=self.edges.size + 1)
+        else:
+            keys, counts = np.unique([_category_key(v) for v in values], return_counts=True)
+            for k, c in zip(keys, counts):
+                self._count(k, int(c))
+            x = values[[_category_key(v) != 'nan' for v in values]]
+            try:
+                x = x.astype(np.float64)
+            except (TypeError, ValueError):
+                return self
+        if x.size:
+            self._combine(x.size, float(x.mean()), float(((x - x.mean()) ** 2).sum()))
+        return self
+
+    def _combine(self, n, mean, m2):
+        total = self.n + n
+        delta = mean - self.mean
+        self.m2 += m2 + delta ** 2 * self.n * n / total
+        self.mean += delta * n / total
+        self.n = total
+
+    def merge(self, other):
+        if self.kind == 'numeric':
+            if not np.array_equal(self.edges, other.edges):
+                raise ValueError("Cannot merge sketches with different bin edges")
+            self.counts += other.counts
+        else:
+            for k, c in other.counts.items():
+                self._count(k, c)
+        if other.n:
+            self._combine(other.n, other.mean, other.m2)
+        return self
+
+    @property
+    def total(self):
+        return int(sum(self.counts.values()) if self.kind == 'categorical' else self.counts.sum())
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else 0.0
+
+    def distributions(self, other):
+        """Proportions alignées (self, other) sur les mêmes cases."""
+        if self.kind == 'numeric':
+            a, b = self.counts, other.counts
+        else:
+            keys = sorted(set(self.counts) | set(other.counts))
+            a = np.array([self.counts.get(k, 0) for k in keys])
+            b = np.array([other.counts.get(k, 0) for k in keys])
+        return a / max(a.sum(), 1), b / max(b.sum(), 1)
+
+    def to_dict(self):
+        counts = self.counts.tolist() if self.kind == 'numeric' else self.counts
+        return {'kind': self.kind, 'edges': self.edges.tolist(), 'counts': counts,
+                'max_keys': self.max_keys, 'n': self.n, 'mean': self.mean, 'm2': self.m2}
+
+    @classmethod
+    def from_dict(cls, d):
+        sketch = cls(d['kind'], d['edges'], max_keys=d.get('max_keys'))
+        sketch.counts = (np.asarray(d['counts'], dtype=np.int64) if d['kind'] == 'numeric'
+                         else dict(d['counts']))
+        sketch.n, sketch.mean, sketch.m2 = d['n'], d['mean'], d['m2']
+        return sketch
+
+
+def psi(expected, actual):
+    """Population Stability Index entre deux distributions sur les mêmes cases."""
+    e, a = np.maximum(expected, _EPS), np.maximum(actual, _EPS)
+    return float(((a - e) * np.log(a / e)).sum())
+
+
+def ks(expected, actual):
+    """Statistique KS sur les cases (borne inférieure de la KS exacte)."""
+    return float(np.abs(np.cumsum(expected) - np.cumsum(actual)).max()) if len(expected) else 0.0
+
+
+class DriftMonitor:
+    """
+    Surveille la dérive des features et des prédictions sur les lots entrants.
+
+    La référence est construite une fois sur les données d'entraînement
+    (`from_frame`) ; chaque lot met à jour une fenêtre (`window`) de sketches
+    aux mêmes bornes, fusionnable entre processus. `report` compare la fenêtre
+    à la référence (PSI et KS par variable), sans conserver les lignes.
+    """
+
+    def __init__(self, sketches):
+        self.sketches = sketches
+
+    @classmethod
+    def from_frame(cls, df, columns=None, n_bins=10, max_categories=10):
+        """Référence : bornes aux quantiles de `df`, modalités des variables discrètes."""
+        from pandas.api.types import is_bool_dtype, is_numeric_dtype
+        if columns is None:
+            # les colonnes texte (bloc creux de la description) ne sont pas suivies
+            columns = [c for c in df.columns if c not in EXCLUDED_COLS
+                       and (is_bool_dtype(df[c].dtype) or is_numeric_dtype(df[c].dtype))]
+        sketches = {}
+        for col in columns:
+            values = df[col]
+            if is_bool_dtype(values.dtype) or values.nunique(dropna=True) <= max_categories:
+                sketch = FeatureSketch('categorical', max_keys=max_categories + 1)  # + NaN
+            else:
+                x = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                qs = np.linspace(0, 1, n_bins + 1)[1:-1]
+                sketch = FeatureSketch('numeric', np.unique(np.nanquantile(x, qs)))
+            sketches[col] = sketch.update(values.to_numpy())
+        return cls(sketches)
+
+    def window(self):
+        """Fenêtre vide alignée sur cette référence."""
+        return DriftMonitor({col: s.empty() for col, s in self.sketches.items()})
+
+    def update(self, df, predictions=None):
+        """Ajoute un lot : features (colonnes connues présentes) et prédictions."""
+        for col, sketch in self.sketches.items():
+            if col in df.columns:
+                sketch.update(df[col].to_numpy())
+        if predictions is not None and PREDICTION_COL in self.sketches:
+            self.sketches[PREDICTION_COL].update(predictions)
+        return self
+
+    def merge(self, other):
+        for col, sketch in other.sketches.items():
+            self.sketches[col].merge(sketch)
+        return self
+
+    @property
+    def n_rows(self):
+        return max((s.total for s in self.sketches.values()), default=0)
+
+    def report(self, window):
+        """Dérive de `window` par rapport à cette référence, une ligne par variable."""
+        import pandas as pd
+        rows = []
+        for col, ref in self.sketches.items():
+            cur = window.sketches[col]
+            e, a = ref.distributions(cur)
+            value = psi(e, a) if cur.total else np.nan
+            status = ('n/a' if not cur.total else 'stable' if value < PSI_THRESHOLDS[0]
+                      else 'moderate' if value < PSI_THRESHOLDS[1] else 'drift')
+            rows.append({'feature': col, 'kind': ref.kind, 'n': cur.total,
+                         'psi': value, 'ks': ks(e, a) if cur.total else np.nan,
+                         'mean_ref': ref.mean, 'mean_cur': cur.mean if cur.n else np.nan,
+                         'std_ref': ref.std, 'std_cur': cur.std if cur.n else np.nan,
+                         'status': status})
+        return pd.DataFrame(rows).sort_values('psi', ascending=False, na_position='last')
+
+    def save(self, path):
+        """Écriture atomique (JSON) : un lecteur ne voit jamais de fichier partiel."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({col: s.to_dict() for col, s in self.sketches.items()}, f)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls({col: FeatureSketch.from_dict(d) for col, d in json.load(f).items()})
@@ -0,0 +1,132 @@
+import os
+import pickle
+import tempfile
+from src.data_processing.parser import parse_markets
+
+STORED_COLS = ['Company', 'final_score', 'ml_score', 'fuzzy_score', 'Stage', 'region', 'markets']
+
+
+def _token(kind, value):
+    return f"{kind}:{str(value).strip().lower()}"
+
+
+class RankingIndex:
+    """
+    Index de classement sur les scores finaux : liste triée par `final_score`
+    et index inversé (marchés, région, stage) -> lignes, chaque liste de
+    postings étant elle aussi triée par score. Une requête top-N filtrée
+    parcourt la plus courte liste de postings et s'arrête dès N résultats.
+    """
+
+    def __init__(self, key_col='Company', score_col='final_score'):
+        self.key_col = key_col
+        self.score_col = score_col
+        self.rows = {}       # id de ligne -> enregistrement
+        self.ids = {}        # clé (Company) -> id de ligne
+        self.order = []      # [(-score, id)] trié
+        self.postings = {}   # token -> ([(-score, id)] trié, {id})
+        self._next_id = 0
+
+    @classmethod
+    def from_frame(cls, df, **kwargs):
+        return cls(**kwargs).upsert(df)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _tokens(self, record):
+        tokens = [_token('market', m) for m in record['markets']]
+        for kind, col in (('region', 'region'), ('stage', 'Stage')):
+            if record.get(col) is not None:
+                tokens.append(_token(kind, record[col]))
+        return tokens
+
+    def upsert(self, df):
+        """Ajoute ou remplace (par clé) les lignes scorées de `df`."""
+        cols = [c for c in STORED_COLS if c in df.columns]
+        batch = {}
+        for record in df[cols].to_dict('records'):
+            score = record.get(self.score_col)
+            if score is None or score != score:  # pas de score : non classable
+                continue
+            for col in ('region', 'Stage'):
+                if record.get(col) != record.get(col):
+                    record[col] = None
+            record['markets'] = parse_markets(record.get('markets'))
+            batch[record[self.key_col]] = record
+
+        # remplacements : un seul filtrage par liste touchée, pas une suppression par clé
+        removed = {self.ids.pop(key) for key in batch if key in self.ids}
+        touched = {id(self.order): self.order}
+        for rid in removed:
+            for tok in self._tokens(self.rows[rid]):
+                ranked, ids = self.postings[tok]
+                ids.discard(rid)
+                touched[id(ranked)] = ranked
+            del self.rows[rid]
+        if removed:
+            for ranked in touched.values():
+                ranked[:] = [e for e in ranked if e[1] not in removed]
+
+        # ajout en fin de liste puis un seul tri (timsort fusionne la partie déjà triée)
+        for key, record in batch.items():
+            rid = self._next_id
+            self._next_id += 1
+            self.rows[rid] = record
+            self.ids[key] = rid
+            entry = (-record[self.score_col], rid)
+            self.order.append(entry)
+            for tok in self._tokens(record):
+                ranked, ids = self.postings.setdefault(tok, ([], set()))
+                ranked.append(entry)
+                ids.add(rid)
+                touched[id(ranked)] = ranked
+        for ranked in touched.values():
+            ranked.sort()
+        for tok in [t for t, (_, ids) in self.postings.items() if not ids]:
+            del self.postings[tok]
+        return self
+
+    def top(self, n=20, markets=(), region=None, stage=None):
+        """Top-N par score final, filtré sur tous les critères fournis (ET)."""
+        if n <= 0:
+            return []
+        if isinstance(markets, str):
+            markets = [markets]
+        tokens = [_token('market', m) for m in markets]
+        if region:
+            tokens.append(_token('region', region))
+        if stage:
+            tokens.append(_token('stage', stage))
+
+        if not tokens:
+            candidates, others = self.order, []
+        else:
+            lists = [self.postings.get(t) for t in tokens]
+            if any(p is None for p in lists):
+                return []
+            lists.sort(key=lambda p: len(p[1]))
+            candidates, others = lists[0][0], [p[1] for p in lists[1:]]
+
+        out = []
+        for _, rid in candidates:
+            if all(rid in ids for ids in others):
+                out.append(self.rows[rid])
+                if len(out) == n:
+                    break
+        return out
+
+    def save(self, path):
+        """Écriture atomique : les lecteurs ne voient jamais un fichier partiel."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return path
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+_EMPTY = -1
+
+
+def _key_hash(key):
+    """Hachage stable entre processus (contrairement à hash())."""
+    return int.from_bytes(hashlib.blake2b(str(key).encode(), digest_size=8).digest(), 'little')
+
+
+def _build_table(keys):
+    """Table à adressage ouvert (sondage linéaire) : slot -> ligne, capacité 2^k >= 2n."""
+    capacity = 1 << max(int(2 * len(keys) - 1).bit_length(), 3)
+    mask = capacity - 1
+    slots = np.full(capacity, _EMPTY, dtype=np.int64)
+    hashes = np.zeros(capacity, dtype=np.uint64)
+    for row, key in enumerate(keys):
+        h = _key_hash(key)
+        slot = h & mask
+        while slots[slot] != _EMPTY:
+            slot = (slot + 1) & mask
+        slots[slot], hashes[slot] = row, h
+    return slots, hashes
+
+
+def _column_array(values):
+    from pandas.api.types import is_bool_dtype, is_numeric_dtype
+    if is_bool_dtype(values.dtype) and not values.isna().any():
+        return values.to_numpy(dtype=bool)
+    if is_numeric_dtype(values.dtype) and not is_bool_dtype(values.dtype):
+        return values.to_numpy(dtype=np.float64 if values.isna().any() else None)
+    # texte en largeur fixe : directement mappable, sans pickle
+    return values.fillna('').astype(str).to_numpy(dtype=str)
+
+
+def _to_python(value):
+    value = value.item() if isinstance(value, np.generic) else value
+    return None if isinstance(value, float) and np.isnan(value) else value
+
+
+def _npy_dtype(path):
+    """Type d'un .npy lu dans son en-tête, sans charger ni mapper les données."""
+    with open(path, 'rb') as f:
+        major, _ = np.lib.format.read_magic(f)
+        read = np.lib.format.read_array_header_1_0 if major == 1 else np.lib.format.read_array_header_2_0
+        return read(f)[2]
+
+
+def _common_dtype(dtypes):
+    """Type commun des morceaux d'une colonne : texte s'il y en a, sinon promotion NumPy."""
+    widths = [t.itemsize // 4 for t in dtypes if t.kind == 'U']
+    if widths:
+        return np.dtype(f"U{max(max(widths), 1)}")
+    return np.result_type(*dtypes)
+
+
+def _as_text(values):
+    if values.dtype.kind == 'U':
+        return values
+    return np.array(['' if _to_python(v) is None else str(_to_python(v)) for v in values], dtype=str)
+
+
+class ScoreStore:
+    """
+    Magasin de scores en colonnes de largeur fixe (.npy), mappées en mémoire,
+    avec un index de hachage Company -> ligne. Une recherche ne lit que les
+    pages utiles. Chaque réécriture crée un répertoire de version complet puis
+    bascule le pointeur CURRENT par os.replace : un lecteur voit l'ancienne ou
+    la nouvelle version, jamais un fichier partiel.
+    """
+
+    def __init__(self, root, version, meta, columns, slots, hashes):
+        self.root = root
+        self.version = version
+        self.key_col = meta['key_col']
+        self.n_rows = meta['n_rows']
+        self.columns = columns
+        self.slots = slots
+        self.hashes = hashes
+        self._mask = slots.size - 1
+
+    @staticmethod
+    def current_version(root):
+        with open(os.path.join(root, 'CURRENT')) as f:
+            return f.read().strip()
+
+    @classmethod
+    def load(cls, root, retries=5):
+        # une version peut être supprimée entre la lecture de CURRENT et son
+        # ouverture (réécritures rapprochées) : on relit alors CURRENT
+        for attempt in range(retries):
+            version = cls.current_version(root)
+            try:
+                return cls._open(root, version)
+            except FileNotFoundError:
+                if attempt == retries - 1 or cls.current_version(root) == version:
+                    raise
+
+    @classmethod
+    def _open(cls, root, version):
+        directory = os.path.join(root, version)
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        mmap = lambda name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+        columns = {col: mmap(f"col_{i}") for i, col in enumerate(meta['columns'])}
+        return cls(root, version, meta, columns, mmap('slots'), mmap('hashes'))
+
+    @classmethod
+    def write(cls, df, root, key_col='Company', keep=2):
+        """Écrit `df` comme nouvelle version (dernière occurrence par clé) et la publie."""
+        return ScoreStoreWriter(root, key_col=key_col, keep=keep).write(df).close()
+
+    @classmethod
+    def upsert(cls, df, root, key_col='Company', keep=2):
+        """Fusionne `df` avec la version courante (remplacement par clé) et publie le résultat."""
+        return ScoreStoreWriter(root, key_col=key_col, keep=keep, merge=True).write(df).close()
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame({col: np.asarray(values) for col, values in self.columns.items()})
+
+    def __len__(self):
+        return self.n_rows
+
+    def __contains__(self, key):
+        return self.row(key) is not None
+
+    def row(self, key):
+        """Numéro de ligne de `key`, ou None."""
+        key = str(key)
+        h = _key_hash(key)
+        slot = h & self._mask
+        keys = self.columns[self.key_col]
+        while True:
+            row = int(self.slots[slot])
+            if row == _EMPTY:
+                return None
+            if int(self.hashes[slot]) == h and keys[row] == key:
+                return row
+            slot = (slot + 1) & self._mask
+
+    def get(self, key):
+        """Enregistrement de `key` (dict), ou None."""
+        row = self.row(key)
+        if row is None:
+            return None
+        return {col: _to_python(values[row]) for col, values in self.columns.items()}
+
+    def get_many(self, keys):
+        """Lignes des clés trouvées, dans l'ordre demandé (DataFrame)."""
+        import pandas as pd
+        rows = [r for r in (self.row(k) for k in keys) if r is not None]
+        idx = np.asarray(rows, dtype=np.int64)
+        return pd.DataFrame({col: np.asarray(values[idx]) for col, values in self.columns.items()})
+
+
+class ScoreStoreWriter:
+    """
+    Écrit une version du ScoreStore lot par lot : chaque lot est déposé en
+    colonnes .npy temporaires, assemblées colonne par colonne à la fermeture
+    (dernière occurrence par clé) par écriture séquentielle. La mémoire reste
+    de l'ordre d'un lot, plus la colonne clé. Avec merge=True, la version
+    courante sert de premier lot.
+    """
+
+    def __init__(self, root, key_col='Company', keep=2, merge=False):
+        self.root = root
+        self.key_col = key_col
+        self.keep = keep
+        os.makedirs(root, exist_ok=True)
+        self._tmp_dir = tempfile.mkdtemp(dir=root, prefix='.tmp-')
+        self._parts = {}   # colonne -> {n° de lot: chemin du .npy}
+        self._sizes = []
+        if merge and os.path.exists(os.path.join(root, 'CURRENT')):
+            self._add_current()
+
+    def _add_current(self):
+        current = ScoreStore.load(self.root)
+        for i, (col, values) in enumerate(current.columns.items()):
+            path = os.path.join(self._tmp_dir, f"part_{len(self._sizes)}_{i}.npy")
+            try:
+                # lien dur : pas de copie, et la version peut être supprimée ensuite
+                os.link(os.path.join(self.root, current.version, f"col_{i}.npy"), path)
+            except OSError:
+                np.save(path, values)
+            self._parts.setdefault(col, {})[len(self._sizes)] = path
+        self._sizes.append(current.n_rows)
+
+    def write(self, df):
+        if self.key_col not in df.columns:
+            raise ValueError(f"Missing key column '{self.key_col}'")
+        for i, col in enumerate(df.columns):
+            path = os.path.join(self._tmp_dir, f"part_{len(self._sizes)}_{i}.npy")
+            np.save(path, _column_array(df[col]))
+            self._parts.setdefault(col, {})[len(self._sizes)] = path
+        self._sizes.append(len(df))
+        return self
+
+    def _assemble(self, col, rows, offsets, path):
+        parts = [self._parts[col].get(k) for k in range(len(self._sizes))]
+        # une colonne absente d'un lot y vaut NaN (comme pd.concat)
+        dtypes = [_npy_dtype(p) if p else np.dtype(np.float64)
+                  for p, n in zip(parts, self._sizes) if n]
+        dtype = _common_dtype(dtypes or [_npy_dtype(p) for p in parts if p])
+        with open(path, 'wb') as f:
+            np.lib.format.write_array_header_1_0(f, {'descr': np.lib.format.dtype_to_descr(dtype),
+                                                     'fortran_order': False, 'shape': (int(rows.size),)})
+            for k, part in enumerate(parts):
+                lo, hi = np.searchsorted(rows, offsets[k:k + 2])
+                if hi == lo:
+                    continue
+                # mappage limité à ce morceau : les pages lues sont libérées aussitôt
+                values = (np.load(part, mmap_mode='r')[rows[lo:hi] - offsets[k]] if part
+                          else np.full(hi - lo, np.nan))
+                values = _as_text(values) if dtype.kind == 'U' else values
+                f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+    def close(self):
+        """Assemble et publie la version ; retourne le ScoreStore correspondant (None si vide)."""
+        if not self._sizes:
+            self.abort()
+            return None
+        tmp_dir = self._tmp_dir
+        try:
+            offsets = np.concatenate([[0], np.cumsum(self._sizes)]).astype(np.int64)
+            keys = np.concatenate([_as_text(np.load(self._parts[self.key_col][k]))
+                                   for k in range(len(self._sizes))])
+            # dernière occurrence de chaque clé, dans l'ordre d'arrivée
+            _, last = np.unique(keys[::-1], return_index=True)
+            rows = np.sort(keys.size - 1 - last)
+            columns = list(self._parts)
+            for i, col in enumerate(columns):
+                self._assemble(col, rows, offsets, os.path.join(tmp_dir, f"col_{i}.npy"))
+            self._parts = {}
+            for name in os.listdir(tmp_dir):
+                if name.startswith('part_'):
+                    os.remove(os.path.join(tmp_dir, name))
+            slots, hashes = _build_table(keys[rows])
+            np.save(os.path.join(tmp_dir, 'slots.npy'), slots)
+            np.save(os.path.join(tmp_dir, 'hashes.npy'), hashes)
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+                json.dump({'key_col': self.key_col, 'n_rows': int(rows.size), 'columns': columns}, f)
+            versions = sorted(v for v in os.listdir(self.root) if v.startswith('v'))
+            version = f"v{int(versions[-1][1:]) + 1 if versions else 1:06d}"
+            os.rename(tmp_dir, os.path.join(self.root, version))
+        except BaseException:
+            self.abort()
+            raise
+
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix='.tmp-')
+        with os.fdopen(fd, 'w') as f:
+            f.write(version)
+        os.replace(tmp, os.path.join(self.root, 'CURRENT'))
+
+        # les lecteurs qui ont encore mappé une version supprimée la conservent
+        for old in (versions + [version])[:-self.keep]:
+            shutil.rmtree(os.path.join(self.root, old), ignore_errors=True)
+        return ScoreStore.load(self.root)
+
+    def abort(self):
+        self._parts = {}
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,196 @@
+import json
+import os
+import tempfile
+import numpy as np
+from src.data_processing.text import DEFAULT_N_FEATURES, hash_text, investor_text
+
+
+def _append_rows(buf, rows, n):
+    """Écrit `rows` après les `n` premières lignes de `buf` (capacité doublée au besoin)."""
+    if n + len(rows) > len(buf):
+        grown = np.empty((max(2 * len(buf), n + len(rows), 16),) + buf.shape[1:], dtype=buf.dtype)
+        grown[:n] = buf[:n]
+        buf = grown
+    buf[n:n + len(rows)] = rows
+    return buf
+
+
+class SimilarityIndex:
+    """
+    Recherche d'investisseurs similaires sur la description et les marchés.
+
+    Les textes sont vectorisés par hachage (TF sans état, normalisé L2), puis
+    projetés aléatoirement en `dim` dimensions. Un index à listes inversées
+    (IVF) regroupe ces projections autour de `n_lists` centroïdes ; une requête
+    visite les `n_probe` listes les plus proches et reclasse les candidats par
+    cosinus exact sur les vecteurs hachés. Les ajouts sont rattachés au
+    centroïde le plus proche ; les centroïdes sont réappris quand la taille de
+    l'index a quadruplé depuis le dernier apprentissage. Sous `min_train`
+    lignes, la recherche reste exhaustive.
+    """
+
+    def __init__(self, n_features=DEFAULT_N_FEATURES, dim=128, n_probe=16, min_train=2000, seed=42):
+        self.n_features = n_features
+        self.dim = dim
+        self.n_probe = n_probe
+        self.min_train = min_train
+        self.seed = seed
+
+        self.companies = []
+        self.positions = {}
+        self._chunks = []          # blocs CSR ajoutés, fusionnés à la demande
+        self._matrix = None
+        # tampons à capacité doublée : un ajout ne recopie pas tout l'index
+        self._embeddings = np.zeros((0, dim), dtype=np.float32)
+        self.centroids = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self.lists = []
+        self._trained_size = 0
+        self._init_projection()
+
+    def _init_projection(self):
+        from sklearn.random_projection import SparseRandomProjection
+        import scipy.sparse as sp
+        # déterministe pour (n_features, dim, seed) : inutile de la sauvegarder
+        srp = SparseRandomProjection(n_components=self.dim, random_state=self.seed)
+        srp.fit(sp.csr_matrix((1, self.n_features)))
+        self._projection = srp.components_.T.tocsr()
+
+    def __len__(self):
+        return len(self.companies)
+
+    @property
+    def embeddings(self):
+        return self._embeddings[:len(self)]
+
+    @property
+    def assign(self):
+        return self._assign[:len(self)] if self.centroids is not None else self._assign[:0]
+
+    @property
+    def matrix(self):
+        import scipy.sparse as sp
+        if self._chunks:
+            blocks = ([self._matrix] if self._matrix is not None else []) + self._chunks
+            self._matrix = sp.vstack(blocks, format='csr')
+            self._chunks = []
+        if self._matrix is None:
+            return sp.csr_matrix((0, self.n_features))
+        return self._matrix
+
+    def _embed(self, X):
+        Z = np.asarray((X @ self._projection).todense(), dtype=np.float32)
+        norms = np.linalg.norm(Z, axis=1, keepdims=True)
+        return Z / np.where(norms > 0, norms, 1)
+
+    def _nearest_lists(self, Z, n):
+        sims = Z @ self.centroids.T
+        if n == 1:
+            return sims.argmax(axis=1)
+        return np.argsort(-sims, axis=1)[:, :n]
+
+    def _train(self):
+        from sklearn.cluster import MiniBatchKMeans
+        n_lists = max(int(np.sqrt(len(self))), 1)
+        km = MiniBatchKMeans(n_clusters=n_lists, random_state=self.seed, n_init=3,
+                             batch_size=4096).fit(self.embeddings)
+        centroids = km.cluster_centers_.astype(np.float32)
+        self.centroids = centroids / np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        self._trained_size = len(self)
+        self._assign_lists(0)
+
+    def _assign_lists(self, start):
+        # rattache les lignes [start:] à leur centroïde, les listes existantes sont conservées
+        new = self._nearest_lists(self.embeddings[start:], 1).astype(np.int32)
+        self._assign = _append_rows(self._assign, new, start)
+        if start == 0:
+            self.lists = [[] for _ in range(len(self.centroids))]
+        for offset, lst in enumerate(new.tolist()):
+            self.lists[lst].append(start + offset)
+
+    def add(self, df, key_col='Company'):
+        """Insère de nouveaux investisseurs (une clé déjà présente est ignorée)."""
+        # test d'appartenance au dict : coût proportionnel au lot, pas à l'index
+        df = df[[key not in self.positions for key in df[key_col]]].drop_duplicates(subset=key_col)
+        if df.empty:
+            return self
+        X = hash_text(investor_text(df), self.n_features)
+        start = len(self.companies)
+        for offset, key in enumerate(df[key_col].tolist()):
+            self.positions[key] = start + offset
+        self.companies.extend(df[key_col].tolist())
+        self._chunks.append(X)
+        self._embeddings = _append_rows(self._embeddings, self._embed(X), start)
+
+        if len(self) >= self.min_train and len(self) >= 4 * self._trained_size:
+            self._train()
+        elif self.centroids is not None:
+            self._assign_lists(start)
+        return self
+
+    def _query_vector(self, company=None, text=None):
+        if company is not None:
+            pos = self.positions[company]
+            return self.matrix[pos], pos
+        return hash_text([text], self.n_features), None
+
+    def query(self, company=None, text=None, k=10, exact=False):
+        """
+        Les `k` investisseurs les plus proches d'un investisseur indexé (`company`)
+        ou d'un texte libre. `exact=True` force la recherche exhaustive.
+        Retourne une liste de (Company, similarité cosinus).
+        """
+        q, own = self._query_vector(company, text)
+        if exact or self.centroids is None:
+            rows = np.arange(len(self.companies))
+        else:
+            probes = self._nearest_lists(self._embed(q), min(self.n_probe, len(self.lists)))[0]
+            rows = np.concatenate([np.asarray(self.lists[p], dtype=np.int64) for p in probes])
+        if own is not None:
+            rows = rows[rows != own]
+        if rows.size == 0:
+            return []
+        sims = np.asarray((self.matrix[rows] @ q.T).todense()).ravel()
+        top = np.argsort(-sims, kind='stable')[:k]
+        return [(self.companies[rows[i]], float(sims[i])) for i in top]
+
+    def save(self, path):
+        """Écriture atomique dans un seul fichier .npz."""
+        X = self.matrix
+        header = json.dumps({'n_features': self.n_features, 'dim': self.dim, 'n_probe': self.n_probe,
+                             'min_train': self.min_train, 'seed': self.seed, 'shape': list(X.shape),
+                             'trained_size': self._trained_size})
+        arrays = {'companies': np.asarray(self.companies, dtype=str), 'data': X.data,
+                  'indices': X.indices, 'indptr': X.indptr, 'embeddings': self.embeddings,
+                  'assign': self.assign}
+        if self.centroids is not None:
+            arrays['centroids'] = self.centroids
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp.npz')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, header=np.asarray(header), **arrays)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        import scipy.sparse as sp
+        with np.load(path, allow_pickle=False) as npz:
+            header = json.loads(str(npz['header']))
+            shape = tuple(header.pop('shape'))
+            trained_size = header.pop('trained_size')
+            index = cls(**header)
+            index._matrix = sp.csr_matrix((npz['data'], npz['indices'], npz['indptr']), shape=shape)
+            index.companies = npz['companies'].tolist()
+            index._embeddings = npz['embeddings']
+            index._assign = npz['assign']
+            if 'centroids' in npz.files:
+                index.centroids = npz['centroids']
+        index.positions = {c: i for i, c in enumerate(index.companies)}
+        index._trained_size = trained_size
+        if index.centroids is not None:
+            index.lists = [[] for _ in range(len(index.centroids))]
+            for row, lst in enumerate(index.assign.tolist()):
+                index.lists[lst].append(row)
+        return index
@@ -0,0 +1,81 @@
+import unittest
+import tempfile
+import contextlib
+import io
+import sys
+import os
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+import pandas as pd
+from src.cli import main
+
+
+class TestCli(unittest.TestCase):
+    """Chaîne featurize -> train -> score sur un répertoire d'artefacts temporaire."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.common = ['--input', os.path.join(ROOT_DIR, 'data', 'cleaned_data.csv'),
+                       '--artifacts', os.path.join(self.tmp, 'artifacts'), '--as-of', '2025-01-01']
+
+    def _run(self, *argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            code = main([argv[0], *self.common, *argv[1:]])
+        self.assertEqual(code, 0, out.getvalue())
+        return out.getvalue()
+
+    def test_featurize_train_score(self):
+        self.assertIn('computed', self._run('featurize'))
+        self.assertIn('cache hit', self._run('featurize'))
+        self._run('train')
+
+        output = os.path.join(self.tmp, 'scores')
+        self.assertIn('Exported', self._run('score', '--output', output))
+        self.assertIn('cache hit', self._run('score', '--output', output))
+        scores = pd.read_csv(output + '.csv')
+        self.assertTrue(scores['final_score'].between(0, 1).all())
+
+        # des lots plus petits donnent exactement les mêmes scores
+        self._run('score', '--output', output + '_chunked', '--chunksize', '37')
+        pd.testing.assert_frame_equal(scores, pd.read_csv(output + '_chunked.csv'))
+
+        company = scores['Company'].iloc[0]
+        self.assertIn(company, self._run('investor', company))
+        self.assertIn(company, self._run('top', '-n', str(len(scores))))
+
+    def test_text_model_scores_through_joblib(self):
+        self._run('train')
+        self._run('train', '--text')
+        artifacts = os.path.join(self.tmp, 'artifacts')
+        self.assertFalse(os.path.exists(os.path.join(artifacts, 'model_compiled.npz')))
+
+        # pas de version compilée : `score` se rabat sur model.joblib, lot par lot
+        output = os.path.join(self.tmp, 'scores')
+        self._run('score', '--output', output, '--chunksize', '50')
+        self._run('score', '--output', output + '_whole')
+        scores = pd.read_csv(output + '.csv')
+        self.assertNotIn('description', scores.columns)
+        pd.testing.assert_frame_equal(scores, pd.read_csv(output + '_whole.csv'))
+
+    def test_score_parquet_with_empty_first_chunk(self):
+        self._run('train')
+        # premier lot sans aucune région : le schéma parquet ne doit pas la typer en double
+        raw = pd.read_csv(os.path.join(ROOT_DIR, 'data', 'cleaned_data.csv'))
+        raw.loc[:9, 'region'] = None
+        path = os.path.join(self.tmp, 'no_region.csv')
+        raw.to_csv(path, index=False)
+
+        output = os.path.join(self.tmp, 'scores')
+        self._run('score', '--input', path, '--output', output, '--format', 'parquet', '--chunksize', '10')
+        scores = pd.read_parquet(output + '.parquet')
+        self.assertEqual(len(scores), len(raw))
+        self.assertTrue(scores['region'].iloc[:10].isna().all())
+        self.assertEqual(scores['region'].iloc[10:].tolist(), raw['region'].iloc[10:].tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
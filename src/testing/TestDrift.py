@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+import numpy as np
+import pandas as pd
+from src.monitoring.drift import DriftMonitor
+
+
+class TestDrift(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 2000
+        self.train = pd.DataFrame({'follow_on_rate': rng.random(n),
+                                   'market__ai': rng.random(n) < 0.3,
+                                   'prediction': rng.normal(17, 2, n)})
+        self.reference = DriftMonitor.from_frame(self.train)
+
+    def test_merge_matches_single_pass(self):
+        batch = self.train.sample(frac=0.5, random_state=1)
+        whole = self.reference.window().update(batch)
+        left = self.reference.window().update(batch.iloc[:300])
+        right = self.reference.window().update(batch.iloc[300:])
+        merged = left.merge(right)
+        for col, sketch in whole.sketches.items():
+            other = merged.sketches[col]
+            self.assertEqual(sketch.to_dict()['counts'], other.to_dict()['counts'])
+            self.assertAlmostEqual(sketch.mean, other.mean)
+            self.assertAlmostEqual(sketch.std, other.std)
+
+    def test_categorical_keys_are_capped(self):
+        window = self.reference.window()
+        flags = self.reference.sketches['market__ai']
+        for seed in range(5):
+            batch = self.train.assign(market__ai=np.random.default_rng(seed).random(len(self.train)))
+            window.update(batch)
+        self.assertLessEqual(len(window.sketches['market__ai'].counts), len(flags.counts) + 1)
+        merged = self.reference.window().merge(window)
+        self.assertLessEqual(len(merged.sketches['market__ai'].counts), len(flags.counts) + 1)
+        report = self.reference.report(window).set_index('feature')
+        self.assertEqual(report.loc['market__ai', 'status'], 'drift')
+
+    def test_text_columns_are_skipped(self):
+        df = self.train.assign(description=pd.Series(['fintech seed fund'] * len(self.train),
+                                                     dtype='string'))
+        reference = DriftMonitor.from_frame(df)
+        self.assertNotIn('description', reference.sketches)
+        self.assertEqual(set(reference.sketches), set(self.train.columns))
+
+    def test_psi_flags_shift(self):
+        same = self.reference.window().update(self.train.sample(frac=0.5, random_state=2))
+        shifted = self.train.assign(follow_on_rate=self.train['follow_on_rate'] ** 3)
+        drifted = self.reference.window().update(shifted)
+        psi_same = self.reference.report(same).set_index('feature')['psi']
+        psi_shift = self.reference.report(drifted).set_index('feature')['psi']
+        self.assertTrue((psi_same < 0.1).all())
+        self.assertGreater(psi_shift['follow_on_rate'], 0.25)
+        self.assertLess(psi_shift['market__ai'], 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import tempfile
+import sys
+import os
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+import numpy as np
+import pandas as pd
+from src.data_processing.pipeline import DataPipeline
+from src.models.model import InvestorRegressor
+from src.models.trainer import Trainer
+from src.models.export import CompiledRegressor
+
+
+class TestCompiledRegressor(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pipe = DataPipeline(os.path.join(ROOT_DIR, 'data', 'cleaned_data.csv'))
+        pipe.load().transform()
+        cls.X_train, cls.X_test, cls.y_train, _ = pipe.split()
+
+    def _assert_parity(self, model, X):
+        compiled = CompiledRegressor.from_regressor(model)
+        np.testing.assert_allclose(compiled.predict(X), model.predict(X), rtol=1e-9, atol=1e-9)
+
+    def test_lgbm_parity(self):
+        model = InvestorRegressor('lgbm')
+        Trainer(model).fit(self.X_train, self.y_train)
+        self._assert_parity(model, self.X_test)
+        # une ligne isolée passe par le même chemin
+        self._assert_parity(model, self.X_test.iloc[[0]])
+
+    def test_ridge_parity(self):
+        model = InvestorRegressor('ridge')
+        Trainer(model).fit(self.X_train, self.y_train)
+        self._assert_parity(model, self.X_test)
+
+    def test_missing_values_parity(self):
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(500, 4)), columns=list('abcd'))
+        X.loc[rng.random(500) < 0.2, 'a'] = np.nan
+        X.loc[rng.random(500) < 0.2, 'b'] = 0.0
+        y = np.nan_to_num(X['a']) * 3 + X['b'] + rng.normal(size=500)
+        model = InvestorRegressor('lgbm').fit(X, y)
+        self._assert_parity(model, X)
+
+    def test_save_load_roundtrip(self):
+        model = InvestorRegressor('lgbm')
+        Trainer(model).fit(self.X_train, self.y_train)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = CompiledRegressor.from_regressor(model, top_markets=['SaaS']).save(
+                os.path.join(tmp, 'model_compiled.npz'))
+            loaded = CompiledRegressor.load(path)
+        self.assertEqual(loaded.metadata['top_markets'], ['SaaS'])
+        np.testing.assert_allclose(loaded.predict(self.X_test), model.predict(self.X_test))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import json
+import tempfile
+import sys
+import os
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+import pandas as pd
+from src.data_processing.ft_ing import FeatureEngineer
+from src.data_processing.io import file_digest
+from src.data_processing.pipeline import DataPipeline
+
+
+class TestFeatureEngineer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.df = pd.read_csv(os.path.join(ROOT_DIR, 'data', 'cleaned_data.csv'))
+
+    def test_parallel_matches_serial(self):
+        fe = FeatureEngineer(as_of='2025-01-01').fit(self.df)
+        serial = fe.transform(self.df)
+        parallel = fe.transform(self.df, n_jobs=3, chunksize=40)
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_as_of_is_deterministic(self):
+        a = FeatureEngineer(as_of='2025-01-01').transform(self.df)
+        b = FeatureEngineer(as_of='2025-01-01').transform(self.df)
+        c = FeatureEngineer(as_of='2026-01-01').transform(self.df)
+        pd.testing.assert_frame_equal(a, b)
+        dated = a['age_years'] != 0  # dates manquantes remplies à 0
+        diff = (c['age_years'] - a['age_years'])[dated]
+        self.assertTrue((diff - 365 / 365.25).abs().max() < 1e-9)
+
+    def test_default_as_of_is_pinned_per_source(self):
+        csv = os.path.join(ROOT_DIR, 'data', 'cleaned_data.csv')
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # date mémorisée lors d'un calcul d'un jour précédent
+            with open(os.path.join(cache_dir, 'as_of.json'), 'w') as f:
+                json.dump({file_digest(csv): '2024-06-30'}, f)
+            first = DataPipeline(csv, cache_dir=cache_dir).transform()
+            second = DataPipeline(csv, cache_dir=cache_dir).transform()
+            self.assertEqual(first.fe.as_of, pd.Timestamp('2024-06-30'))
+            self.assertFalse(first.cache_hit)
+            self.assertTrue(second.cache_hit)
+            self.assertEqual(second.fe.as_of, first.fe.as_of)
+            # une date explicite reste prioritaire
+            explicit = DataPipeline(csv, cache_dir=cache_dir, as_of='2025-01-01').transform()
+            self.assertEqual(explicit.fe.as_of, pd.Timestamp('2025-01-01'))
+
+    def test_region_columns_fixed_by_fit(self):
+        fe = FeatureEngineer().fit(self.df)
+        usa_only = self.df[self.df['region'] == 'USA']
+        out = fe.transform(usa_only)
+        region_cols = [c for c in out.columns if c.startswith('region_')]
+        self.assertEqual(region_cols, [f'region_{r}' for r in fe.regions_[1:]])
+        self.assertTrue(out['region_USA'].all())
+
+
+if __name__ == "__main__":
+    unittest.main()
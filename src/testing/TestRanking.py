@@ -0,0 +1,53 @@
+import unittest
+import sys
+import os
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+import pandas as pd
+from src.serving.ranking import RankingIndex
+
+
+class TestRankingIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'Company': ['A', 'B', 'C', 'D'],
+            'final_score': [0.9, 0.7, 0.8, 0.4],
+            'Stage': ['Seed', 'Seed', 'Series A', 'Seed'],
+            'region': ['USA', 'UK', 'USA', None],
+            'markets': ["['SaaS', 'AI']", "['Fintech']", "['AI']", "['AI', 'Fintech']"],
+        })
+        self.index = RankingIndex.from_frame(self.df)
+
+    def _companies(self, rows):
+        return [r['Company'] for r in rows]
+
+    def test_filtered_top(self):
+        self.assertEqual(self._companies(self.index.top(3)), ['A', 'C', 'B'])
+        self.assertEqual(self._companies(self.index.top(10, markets=['AI'])), ['A', 'C', 'D'])
+        self.assertEqual(self._companies(self.index.top(10, markets=['ai'], stage='seed')), ['A', 'D'])
+        self.assertEqual(self._companies(self.index.top(10, markets=['AI', 'Fintech'])), ['D'])
+
+    def test_upsert_replaces(self):
+        self.index.upsert(pd.DataFrame({'Company': ['D', 'E'], 'final_score': [0.95, 0.1],
+                                        'Stage': ['Seed', 'Seed'], 'region': ['UK', 'UK'],
+                                        'markets': ["['SaaS']", "['SaaS']"]}))
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(self._companies(self.index.top(2)), ['D', 'A'])
+        self.assertEqual(self._companies(self.index.top(10, markets=['SaaS'])), ['D', 'A', 'E'])
+        # D n'est plus dans ses anciennes listes
+        self.assertEqual(self._companies(self.index.top(10, markets=['Fintech'])), ['B'])
+        self.assertEqual(self._companies(self.index.top(10, region='UK')), ['D', 'B', 'E'])
+
+    def test_empty_postings(self):
+        self.assertEqual(self.index.top(10, markets=['Biotech']), [])
+        self.index.upsert(pd.DataFrame({'Company': ['B'], 'final_score': [0.5], 'Stage': ['Seed'],
+                                        'region': ['USA'], 'markets': ["['AI']"]}))
+        self.assertEqual(self.index.top(10, region='UK'), [])
+        self.assertNotIn('region:uk', self.index.postings)
+        self.assertEqual(self.index.top(0), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
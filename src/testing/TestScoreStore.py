@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+import numpy as np
+import pandas as pd
+from src.serving.score_store import ScoreStore, ScoreStoreWriter
+
+
+class TestScoreStore(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        rng = np.random.default_rng(0)
+        n = 1000
+        self.df = pd.DataFrame({'Company': [f"Fund {i}" for i in range(n)],
+                                'region': rng.choice(['USA', 'UK', None], n),
+                                'region_USA': rng.random(n) < 0.5,
+                                'final_score': rng.random(n)})
+
+    def test_lookup_matches_frame(self):
+        store = ScoreStore.write(self.df, self.root)
+        self.assertEqual(len(store), len(self.df))
+        for i in (0, 17, 999):
+            record = store.get(f"Fund {i}")
+            self.assertAlmostEqual(record['final_score'], self.df['final_score'][i])
+            self.assertEqual(record['region_USA'], self.df['region_USA'][i])
+        self.assertIsNone(store.get('Unknown'))
+        batch = store.get_many(['Fund 5', 'Unknown', 'Fund 3'])
+        self.assertEqual(batch['Company'].tolist(), ['Fund 5', 'Fund 3'])
+
+    def test_rewrite_is_versioned(self):
+        old = ScoreStore.write(self.df, self.root)
+        new = ScoreStore.write(self.df.assign(final_score=0.5), self.root)
+        self.assertNotEqual(old.version, new.version)
+        self.assertEqual(ScoreStore.load(self.root).get('Fund 1')['final_score'], 0.5)
+        # un lecteur déjà ouvert garde une version cohérente
+        self.assertAlmostEqual(old.get('Fund 1')['final_score'], self.df['final_score'][1])
+
+    def test_upsert_merges_with_current_version(self):
+        ScoreStore.write(self.df, self.root)
+        batch = pd.DataFrame({'Company': ['Fund 3', 'New Fund'], 'region': ['UK', 'USA'],
+                              'region_USA': [False, True], 'final_score': [0.9, 0.1]})
+        store = ScoreStore.upsert(batch, self.root)
+        self.assertEqual(len(store), len(self.df) + 1)
+        self.assertEqual(store.get('Fund 3')['final_score'], 0.9)
+        self.assertEqual(store.get('New Fund')['region'], 'USA')
+        self.assertAlmostEqual(store.get('Fund 4')['final_score'], self.df['final_score'][4])
+
+    def test_writer_by_chunks_matches_single_write(self):
+        whole = ScoreStore.write(self.df, os.path.join(self.root, 'whole'))
+        first = self.df.iloc[:400].assign(region=None)   # texte entièrement vide dans ce lot
+        rewritten = self.df.iloc[[5]].assign(final_score=0.75)
+        with ScoreStoreWriter(os.path.join(self.root, 'chunks')) as writer:
+            writer.write(first).write(self.df.iloc[400:]).write(rewritten)
+        chunks = ScoreStore.load(os.path.join(self.root, 'chunks'))
+        self.assertEqual(len(chunks), len(whole))
+        self.assertEqual(chunks.get('Fund 5')['final_score'], 0.75)
+        self.assertEqual(chunks.get('Fund 3')['region'], '')
+        for i in (400, 999):
+            self.assertEqual(chunks.get(f"Fund {i}"), whole.get(f"Fund {i}"))
+        self.assertEqual(chunks.columns['region_USA'].dtype, bool)
+
+    def test_load_retries_after_concurrent_rewrite(self):
+        ScoreStore.write(self.df, self.root)
+        stale = ScoreStore.current_version(self.root)
+        ScoreStore.write(self.df, self.root)
+        ScoreStore.write(self.df.assign(final_score=0.25), self.root)
+        self.assertFalse(os.path.exists(os.path.join(self.root, stale)))
+        # lecteur qui a lu l'ancien CURRENT avant les deux réécritures
+        reads = iter([stale])
+        original = ScoreStore.current_version
+        with mock.patch.object(ScoreStore, 'current_version',
+                               side_effect=lambda root: next(reads, None) or original(root)):
+            store = ScoreStore.load(self.root)
+        self.assertEqual(store.get('Fund 2')['final_score'], 0.25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+import numpy as np
+import pandas as pd
+from src.models.fuzzy_layer import build_fuzzy_system, evaluate_attractiveness
+from src.models.sensitivity import (batch_attractiveness, default_params, random_configs,
+                                    sensitivity_sweep)
+
+
+class TestSensitivity(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 120
+        self.inputs = {'ml_score': rng.random(n), 'follow_on': rng.random(n),
+                       'stage_risk': rng.choice([0.2, 0.3, 0.5, 0.6, 0.8, 1.0], n),
+                       'age_years': rng.random(n) * 45}
+
+    def test_matches_skfuzzy(self):
+        ctx = build_fuzzy_system()
+        expected = [evaluate_attractiveness(ctx, *(self.inputs[k][i] for k in
+                                                   ('ml_score', 'follow_on', 'stage_risk', 'age_years')))
+                    for i in range(len(self.inputs['ml_score']))]
+        got = batch_attractiveness(self.inputs, default_params()[None, :])[0]
+        np.testing.assert_allclose(got, expected, atol=0.05)
+
+    def test_default_config_is_perfectly_stable(self):
+        df = pd.DataFrame({'ml_score': self.inputs['ml_score'], 'follow_on_rate': self.inputs['follow_on'],
+                           'stage_risk': self.inputs['stage_risk'], 'age_years': self.inputs['age_years']})
+        alphas, params = random_configs(5)
+        alphas[0], params[0] = 0.6, default_params()
+        report = sensitivity_sweep(df, alphas, params, top_n=20, block_size=2)
+        self.assertEqual(len(report), 5)
+        self.assertAlmostEqual(report.loc[0, 'top20_overlap'], 1.0)
+        self.assertAlmostEqual(report.loc[0, 'kendall_tau'], 1.0)
+        self.assertAlmostEqual(report.loc[0, 'mean_abs_shift'], 0.0)
+
+    def test_jobs_split_small_sweeps(self):
+        df = pd.DataFrame({'ml_score': self.inputs['ml_score'], 'follow_on_rate': self.inputs['follow_on'],
+                           'stage_risk': self.inputs['stage_risk'], 'age_years': self.inputs['age_years']})
+        alphas, params = random_configs(7)
+        # 7 configurations tiennent dans un seul bloc du budget : réparties sur 2 processus
+        pd.testing.assert_frame_equal(sensitivity_sweep(df, alphas, params, n_jobs=2),
+                                      sensitivity_sweep(df, alphas, params, n_jobs=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
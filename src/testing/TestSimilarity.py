@@ -0,0 +1,55 @@
+import unittest
+import tempfile
+import sys
+import os
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+import numpy as np
+from src.benchmarks.similarity import synthetic_corpus
+from src.data_processing.text import investor_text
+from src.serving.similarity import SimilarityIndex
+
+
+class TestSimilarityIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.corpus = synthetic_corpus(os.path.join(ROOT_DIR, 'data', 'cleaned_data.csv'), n_rows=3000)
+
+    def _index(self, df):
+        return SimilarityIndex(n_features=2 ** 14, min_train=1000).add(df)
+
+    def test_save_load_round_trip(self):
+        index = self._index(self.corpus)
+        with tempfile.TemporaryDirectory() as tmp:
+            loaded = SimilarityIndex.load(index.save(os.path.join(tmp, 'index.npz')))
+        self.assertEqual(loaded.companies, index.companies)
+        np.testing.assert_array_equal(loaded.assign, index.assign)
+        for company in self.corpus['Company'].iloc[:5]:
+            self.assertEqual(loaded.query(company=company, k=5), index.query(company=company, k=5))
+
+    def test_insert_after_training(self):
+        index = self._index(self.corpus.iloc[:1500])
+        self.assertIsNotNone(index.centroids)
+        for start in range(1500, 3000, 100):
+            index.add(self.corpus.iloc[start:start + 100])
+        self.assertEqual(len(index), 3000)
+        self.assertEqual(len(index.assign), 3000)
+        self.assertEqual(sorted(r for lst in index.lists for r in lst), list(range(3000)))
+        # une ligne insérée après l'apprentissage est retrouvée via sa liste
+        last = self.corpus.iloc[[-1]]
+        self.assertEqual(index.query(text=investor_text(last).iloc[0], k=1)[0][0], last['Company'].iloc[0])
+
+    def test_ivf_recall(self):
+        index = self._index(self.corpus)
+        hits = 0
+        queries = self.corpus['Company'].iloc[::60]
+        for company in queries:
+            exact = {c for c, _ in index.query(company=company, k=10, exact=True)}
+            hits += len(exact & {c for c, _ in index.query(company=company, k=10)})
+        self.assertGreater(hits / (10 * len(queries)), 0.8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+import tempfile
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from src.data_processing.pipeline import DataPipeline
+from src.data_processing.text import make_text_block
+from src.models.model import InvestorRegressor
+from src.monitoring.drift import DriftMonitor
+
+
+class TestText(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.csv = os.path.join(ROOT_DIR, 'data', 'cleaned_data.csv')
+        cls.pipe = DataPipeline(cls.csv, text_col='description', as_of='2025-01-01').transform()
+
+    def test_text_block_stays_csr(self):
+        X = self.pipe.df_feat.drop(columns=['market_value_usd'])
+        Z = make_text_block('description', n_features=2 ** 10).fit_transform(X)
+        self.assertTrue(sp.isspmatrix_csr(Z))
+        self.assertEqual(Z.shape, (len(X), X.shape[1] - 1 + 2 ** 10))
+
+    def test_regressor_with_text(self):
+        X_tr, X_te, y_tr, _ = self.pipe.split()
+        for model_type in ('lgbm', 'ridge'):
+            model = InvestorRegressor(model_type, text_col='description', n_text_features=2 ** 10)
+            preds = model.fit(X_tr, np.log1p(y_tr)).predict(X_te)
+            self.assertEqual(preds.shape, (len(X_te),))
+            self.assertTrue(np.isfinite(preds).all())
+
+    def test_cache_hit_keeps_text_column(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = DataPipeline(self.csv, cache_dir=cache_dir, as_of='2025-01-01',
+                                 text_col='description').transform()
+            second = DataPipeline(self.csv, cache_dir=cache_dir, as_of='2025-01-01',
+                                  text_col='description').transform()
+            self.assertFalse(first.cache_hit)
+            self.assertTrue(second.cache_hit)
+            pd.testing.assert_frame_equal(first.df_feat, second.df_feat, check_dtype=False)
+
+    def test_drift_reference_with_text(self):
+        X_tr, _, _, _ = self.pipe.split()
+        reference = DriftMonitor.from_frame(X_tr)
+        self.assertNotIn('description', reference.sketches)
+
+
+if __name__ == '__main__':
+    unittest.main()
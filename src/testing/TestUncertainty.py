@@ -0,0 +1,90 @@
+import unittest
+import tempfile
+import sys
+import os
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+import numpy as np
+from src.data_processing.pipeline import DataPipeline
+from src.models.decision import DecisionSynthesizer
+from src.models.export import CompiledEnsemble
+from src.models.model import InvestorRegressor
+from src.models.trainer import Trainer
+from src.models.uncertainty import IntervalEnsemble, interval_from_members
+
+
+class TestIntervalEnsemble(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pipe = DataPipeline(os.path.join(ROOT_DIR, 'data', 'cleaned_data.csv'), as_of='2025-01-01')
+        pipe.load().transform()
+        cls.X_train, cls.X_test, y_train, y_test = pipe.split()
+        cls.y_train, cls.y_test = np.log1p(y_train), np.log1p(y_test)
+        cls.model = InvestorRegressor('lgbm').fit(cls.X_train, cls.y_train)
+
+    def test_compiled_matches_boosters(self):
+        ens = IntervalEnsemble(self.model, n_members=4, n_jobs=2).fit(self.X_train, self.y_train)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = ens.compile().save(os.path.join(tmp, 'intervals.npz'))
+            compiled = CompiledEnsemble.load(path)
+        self.assertEqual(compiled.metadata['mode'], 'bootstrap')
+        np.testing.assert_allclose(compiled.predict(self.X_test), ens.member_predictions(self.X_test),
+                                   rtol=1e-9, atol=1e-9)
+
+    def test_interval_contains_point(self):
+        ens = IntervalEnsemble(self.model, n_members=8, n_jobs=2).fit(self.X_train, self.y_train)
+        point = self.model.predict(self.X_test)
+        lo, mid, hi = ens.predict_interval(self.X_test, center=point)
+        np.testing.assert_allclose(mid, point)
+        self.assertTrue((lo <= point).all() and (point <= hi).all())
+        self.assertTrue((hi > lo).any())
+
+    def test_empirical_coverage(self):
+        # un tirage par membre : l'écart entre membres reflète le rééchantillonnage.
+        # Le bootstrap n'inclut pas le bruit des données, d'où une couverture
+        # sous la valeur nominale, mais du même ordre (un tirage par itération
+        # donnait ~8 % pour 90 %)
+        coverage = 0.9
+        ens = IntervalEnsemble(self.model, n_members=16, coverage=coverage, n_jobs=2)
+        ens.fit(self.X_train, self.y_train)
+        lo, _, hi = ens.predict_interval(self.X_test, center=self.model.predict(self.X_test))
+        empirical = ((self.y_test >= lo) & (self.y_test <= hi)).mean()
+        self.assertGreaterEqual(empirical, coverage / 2)
+        self.assertLessEqual(empirical, coverage + 0.05)
+
+    def test_quantile_mode(self):
+        ens = IntervalEnsemble(self.model, mode='quantile', coverage=0.8).fit(self.X_train, self.y_train)
+        preds = ens.member_predictions(self.X_test)
+        self.assertEqual(preds.shape, (3, len(self.X_test)))
+        lo, mid, hi = interval_from_members(preds, 'quantile', 0.8)
+        self.assertTrue((lo <= mid).all() and (mid <= hi).all())
+
+    def test_exported_scores_use_training_range(self):
+        trainer = Trainer(InvestorRegressor('lgbm')).fit(self.X_train, np.expm1(self.y_train))
+        trainer.fit_intervals(self.X_train, np.expm1(self.y_train), n_members=4, n_jobs=2)
+        df = trainer.export_ml_scores(self.X_test, self.X_test)
+        # même échelle que `score` : bornes d'entraînement, pas min-max du lot
+        np.testing.assert_allclose(df['ml_score'], trainer.scale(trainer.model.predict(self.X_test)))
+        self.assertTrue((df['ml_score_lo'] <= df['ml_score']).all())
+        self.assertTrue((df['ml_score'] <= df['ml_score_hi']).all())
+        single = trainer.export_ml_scores(self.X_test.iloc[[0]], self.X_test.iloc[[0]])
+        self.assertAlmostEqual(single['ml_score'].iloc[0], df['ml_score'].iloc[0])
+
+    def test_ridge_is_rejected(self):
+        with self.assertRaises(ValueError):
+            IntervalEnsemble(InvestorRegressor('ridge'))
+
+    def test_final_interval_contains_point(self):
+        synth = DecisionSynthesizer()
+        row = {'follow_on_rate': 0.35, 'stage_risk': 0.8, 'age_years': 3.0}
+        for lo, ml, hi in [(0.2, 0.3, 0.6), (0.7, 0.8, 0.8), (0.0, 0.5, 1.0)]:
+            res = {**row, **synth.synthesize_one(row, ml)}
+            bounds = synth.synthesize_interval(res, lo, hi)
+            self.assertLessEqual(bounds['final_score_lo'], res['final_score'])
+            self.assertGreaterEqual(bounds['final_score_hi'], res['final_score'])
+
+
+if __name__ == '__main__':
+    unittest.main()